@@ -4,15 +4,13 @@ Demonstration of the command safety agent functionality.
 
 This script shows how the safety agent analyzes and blocks dangerous commands
 while allowing safe ones to execute normally.
+
+Run after installing clippy in editable mode (`pip install -e .`).
 """
 
 import sys
-from pathlib import Path
 from unittest.mock import Mock
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from clippy.agent.command_safety_checker import create_safety_checker
 from clippy.executor import ActionExecutor
 from clippy.permissions import PermissionConfig, PermissionManager
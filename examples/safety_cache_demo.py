@@ -4,16 +4,14 @@ Demonstration of the safety agent caching functionality.
 
 This script shows how the safety agent caches decisions to improve performance
 and reduce API calls for repeated commands.
+
+Run after installing clippy in editable mode (`pip install -e .`).
 """
 
 import sys
-from pathlib import Path
 from time import sleep
 from unittest.mock import Mock
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from clippy.agent.command_safety_checker import create_safety_checker
 
 
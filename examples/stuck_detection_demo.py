@@ -4,13 +4,9 @@ Demo script showing the stuck subagent detection and recovery features.
 
 This example demonstrates various ways to configure stuck detection
 when running parallel subagents.
-"""
-
-import os
-import sys
 
-# Add the src directory to the path so we can import clippy modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+Run after installing clippy in editable mode (`pip install -e .`).
+"""
 
 from clippy.agent.subagent_utils import (
     analyze_parallel_results,
@@ -8,7 +8,13 @@ from .conversation import (
 from .core import ClippyAgent
 from .errors import format_api_error
 from .exceptions import InterruptedExceptionError
-from .tool_handler import add_tool_result, ask_approval, display_tool_request, handle_tool_use
+from .tool_handler import (
+    add_tool_result,
+    ask_approval,
+    ask_approval_async,
+    display_tool_request,
+    handle_tool_use,
+)
 from .utils import generate_preview_diff, validate_python_syntax
 
 __all__ = [
@@ -23,6 +29,7 @@ __all__ = [
     # Tool handling
     "handle_tool_use",
     "ask_approval",
+    "ask_approval_async",
     "add_tool_result",
     "display_tool_request",
     # Error handling
@@ -1,8 +1,14 @@
 """Shell command safety checker agent."""
 
-import hashlib
+import functools
 import logging
+import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import closing
 from dataclasses import dataclass
 from typing import Any
 
@@ -13,17 +19,74 @@ DEFAULT_CACHE_TTL = 3600  # 1 hour in seconds
 DEFAULT_CACHE_SIZE = 1000  # Maximum number of cached entries
 
 
-@dataclass
+# Quoted strings (possibly unterminated), backslash escapes, or runs of blanks between
+# words. Only the blank runs are collapsed; newlines are kept since they separate
+# shell commands, and quoted or escaped whitespace is part of an argument.
+_SHELL_SPACING_RE = re.compile(r"""'[^']*(?:'|$)|"(?:\\.|[^"\\])*(?:"|$)|\\.|[ \t]+""", re.DOTALL)
+# Blank runs that normalization could change; commands without one are returned as is
+_COLLAPSIBLE_BLANKS_RE = re.compile(r"[ \t]{2,}|\t")
+
+
+def _collapse_spacing(match: re.Match[str]) -> str:
+    """Collapse a run of unquoted blanks, leaving quoted strings and escapes untouched."""
+    token = match.group()
+    return " " if token[0] in " \t" else token
+
+
+def _normalize_command(command: str) -> str:
+    """Normalize a command so spacing variations share one cache key.
+
+    Whitespace inside quotes, after a backslash or in a heredoc body is part of
+    the command's data, so it is never collapsed.
+
+    Args:
+        command: Shell command as passed by the caller
+
+    Returns:
+        Command with surrounding whitespace stripped and unquoted runs of blanks collapsed
+    """
+    command = command.strip()
+    if "<<" in command or not _COLLAPSIBLE_BLANKS_RE.search(command):
+        return command
+    return _SHELL_SPACING_RE.sub(_collapse_spacing, command)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_absolute_dir(path: str) -> str:
+    """Resolve an absolute directory path; callers almost always pass the same few."""
+    return os.path.realpath(path)
+
+
+def _normalize_working_dir(working_dir: str) -> str:
+    """Normalize a working directory so equivalent spellings share one cache key.
+
+    Args:
+        working_dir: Working directory as passed by the caller
+
+    Returns:
+        Canonical absolute path of the directory
+    """
+    working_dir = working_dir.strip()
+    if os.path.isabs(working_dir):
+        return _resolve_absolute_dir(working_dir)
+    # Relative paths depend on the process cwd, so they're resolved every time
+    return os.path.realpath(working_dir)
+
+
+@dataclass(slots=True)
 class SafetyDecision:
-    """Represents a cached safety decision."""
+    """Represents a cached safety decision.
+
+    Slotted since the cache can hold up to ``DEFAULT_CACHE_SIZE`` of these.
+    """
 
     is_safe: bool
     reason: str
-    timestamp: float
+    expires_at: float  # time.monotonic() deadline, unaffected by wall clock changes
 
-    def is_expired(self, ttl: int) -> bool:
+    def is_expired(self) -> bool:
         """Check if this cached decision has expired."""
-        return time.time() - self.timestamp > ttl
+        return time.monotonic() > self.expires_at
 
 
 class SafetyCache:
@@ -38,18 +101,13 @@ class SafetyCache:
         """
         self.max_size = max_size
         self.ttl = ttl
-        self._cache: dict[str, SafetyDecision] = {}
-        self._access_order: list[str] = []
+        # Ordered from least to most recently used
+        self._cache: OrderedDict[tuple[str, str], SafetyDecision] = OrderedDict()
 
-    def _generate_key(self, command: str, working_dir: str) -> str:
+    def _generate_key(self, command: str, working_dir: str) -> tuple[str, str]:
         """Generate a cache key from command and working directory."""
-        # Normalize input for consistent caching
-        normalized_command = command.strip()
-        normalized_dir = working_dir.strip()
-
-        # Create hash key
-        content = f"{normalized_command}|{normalized_dir}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        # Normalize input for consistent caching; the dict hashes the tuple itself
+        return _normalize_command(command), _normalize_working_dir(working_dir)
 
     def get(self, command: str, working_dir: str) -> tuple[bool, str] | None:
         """Get cached safety decision.
@@ -63,24 +121,19 @@ class SafetyCache:
         """
         key = self._generate_key(command, working_dir)
 
-        if key not in self._cache:
+        decision = self._cache.get(key)
+        if decision is None:
             return None
 
-        decision = self._cache[key]
-
         # Check if expired
-        if decision.is_expired(self.ttl):
+        if decision.is_expired():
             del self._cache[key]
-            if key in self._access_order:
-                self._access_order.remove(key)
             return None
 
-        # Update access order (move to end)
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
+        # Mark as most recently used
+        self._cache.move_to_end(key)
 
-        logger.debug(f"Safety cache hit for: {command} in {working_dir}")
+        logger.debug("Safety cache hit for: %s in %s", command, working_dir)
         return decision.is_safe, decision.reason
 
     def put(self, command: str, working_dir: str, is_safe: bool, reason: str) -> None:
@@ -94,25 +147,22 @@ class SafetyCache:
         """
         key = self._generate_key(command, working_dir)
 
-        # Remove from access order if exists to update position
-        if key in self._access_order:
-            self._access_order.remove(key)
-
-        # Add new decision
-        self._cache[key] = SafetyDecision(is_safe=is_safe, reason=reason, timestamp=time.time())
-        self._access_order.append(key)
+        # Add new decision as the most recently used entry; the deadline is computed
+        # once here so lookups only compare against it
+        self._cache[key] = SafetyDecision(
+            is_safe=is_safe, reason=reason, expires_at=time.monotonic() + self.ttl
+        )
+        self._cache.move_to_end(key)
 
-        # Enforce size limit (remove oldest)
+        # Enforce size limit (remove least recently used)
         while len(self._cache) > self.max_size:
-            oldest_key = self._access_order.pop(0)
-            del self._cache[oldest_key]
+            self._cache.popitem(last=False)
 
-        logger.debug(f"Safety decision cached for: {command} in {working_dir}")
+        logger.debug("Safety decision cached for: %s in %s", command, working_dir)
 
     def clear(self) -> None:
         """Clear all cached decisions."""
         self._cache.clear()
-        self._access_order.clear()
         logger.debug("Safety cache cleared")
 
     def get_stats(self) -> dict[str, int]:
@@ -168,6 +218,77 @@ COMMAND_SAFETY_SYSTEM_PROMPT = (
     "find . -name '*.py' -> ALLOW: Project file search\n"
 )
 
+# Shared by every LLM safety check; providers only read the messages they're given
+_SYSTEM_MESSAGE: dict[str, Any] = {"role": "system", "content": COMMAND_SAFETY_SYSTEM_PROMPT}
+
+# Regex pre-check. Each list is fused into a single alternation so a command is
+# scanned once per list; the named groups record which rule matched for logging.
+# Commands matching a dangerous pattern are blocked immediately.
+_DANGEROUS_PATTERNS: dict[str, str] = {
+    "rm_rf_root": r"rm\s+-rf\s+[/.~]",  # rm -rf starting with /, ., or ~
+    "no_preserve_root": r"rm\s+--no-preserve-root",  # Dangerous rm flag
+    "disk_format": r"mkfs|fdisk|format",  # Disk formatting
+    "fork_bomb": r":\(\)\{.*\|\|.*&.*\}\s*:",  # Fork bomb
+    "curl_pipe": r"curl.*\|\s*(bash|sh|python|node|perl)\b",  # Download and execute
+    "wget_pipe": r"wget.*\|\s*(bash|sh|python|node|perl)\b",  # Download and execute
+    "sudo_destructive": r"sudo\s+(rm|mkfs|fdisk|format|chmod\s+777)",  # Dangerous sudo commands
+    "chmod_777_system": r"chmod\s+777\s+/[a-z]",  # Making system files world-writable
+    "system_redirect": r"[>]{2,}\s*/(dev|sys|proc|etc|boot)",  # Redirecting to system files
+    "disk_overwrite": r">\s*/dev/(sd|hd|nvme|vd|xvd)[a-z0-9]*",  # Writing over a raw disk
+}
+
+# Commands matching a safe pattern (and no dangerous one) are allowed immediately
+_SAFE_PATTERNS: dict[str, str] = {
+    "interpreter": r"^(python|node|npm|pip|uv|yarn|cargo|go|java|rustc|ruby|perl|php)\b",
+    "test_runner": r"^(pytest|unittest|jest|test\.py|make|cmake|cargo build)",
+    "vcs": r"^(git|svn|hg)\b",
+    "linter": r"^(ruff|black|isort|mypy|flake8|pylint|eslint|prettier)\b",
+    "inspect": r"^(ls|cat|head|tail|grep|find|wc|cd|pwd|echo|which|whereis)\b",
+    "file_ops": (
+        r"^(mkdir|rmdir|cp|mv|chmod|chown)\b(?!.*(/etc|/boot|/sys|/proc|/usr/bin|/usr/lib))"
+    ),
+    "rm": r"^(rm)\s+(?!-rf\s*[/.~]|-f\s*\*.*)",  # rm without dangerous wildcards or system paths
+    "editor": r"^(touch|ln|read|write|vim|nano|emacs|code)\b",
+    "package_manager": r"^(pip|conda|brew)\s+(install|list|show|freeze|remove|uninstall)",
+    "docker": r"^(docker|docker-compose)\s+(build|run|ps|logs|stop|start)",
+    "make_target": r"^make\s+(clean|test|build|install|help)",
+}
+
+# Programs the safe patterns above allow no matter what follows them, checked with a
+# set lookup on the first word before falling back to the safe regex
+_SAFE_PROGRAMS = frozenset(
+    (
+        "python node npm pip uv yarn cargo go java rustc ruby perl php "
+        "pytest unittest jest make cmake git svn hg "
+        "ruff black isort mypy flake8 pylint eslint prettier "
+        "ls cat head tail grep find wc cd pwd echo which whereis "
+        "touch ln read write vim nano emacs code"
+    ).split()
+)
+
+
+def _compile_rules(patterns: dict[str, str]) -> re.Pattern[str]:
+    """Fuse named patterns into one case-insensitive alternation.
+
+    Args:
+        patterns: Mapping of rule name to regex
+
+    Returns:
+        Compiled pattern whose ``lastgroup`` is the name of the matching rule
+    """
+    return re.compile(
+        "|".join(f"(?P<{name}>{pattern})" for name, pattern in patterns.items()),
+        re.IGNORECASE,
+    )
+
+
+_DANGEROUS_RE = _compile_rules(_DANGEROUS_PATTERNS)
+_SAFE_RE = _compile_rules(_SAFE_PATTERNS)
+
+# Verdict line of the LLM response, e.g. "ALLOW: reason", "block - reason" or "Allow : reason";
+# the reason runs to the end of the first line
+_RESPONSE_RE = re.compile(r"(ALLOW|BLOCK)\s*[:\-]\s*(.*)", re.IGNORECASE)
+
 
 class CommandSafetyChecker:
     """Specialized agent for checking shell command safety with caching."""
@@ -191,9 +312,15 @@ class CommandSafetyChecker:
         self.model = model
         self.cache = SafetyCache(max_size=cache_size, ttl=cache_ttl) if cache_size > 0 else None
 
+        # LLM checks currently running, so concurrent callers (e.g. parallel subagents
+        # sharing this checker) wait for one result instead of asking the LLM again
+        self._inflight: dict[tuple[str, str], Future[tuple[bool, str]]] = {}
+        self._inflight_lock = threading.Lock()
+
         # Performance tracking
         self._cache_hits = 0
         self._cache_misses = 0
+        self._inflight_waits = 0
 
     def check_command_safety(self, command: str, working_dir: str = ".") -> tuple[bool, str]:
         """
@@ -209,52 +336,27 @@ class CommandSafetyChecker:
         Returns:
             Tuple of (is_safe: bool, reason: str)
         """
-        import re
-
         # Quick pre-check for obviously safe/dangerous commands
         command_stripped = command.strip()
 
-        # Block immediately dangerous patterns
-        dangerous_patterns = [
-            r"rm\s+-rf\s+[/.~]",  # rm -rf starting with /, ., or ~
-            r"rm\s+--no-preserve-root",  # Dangerous rm flag
-            r"mkfs|fdisk|format",  # Disk formatting
-            r":\(\)\{.*\|\|.*&.*\}\s*:",  # Fork bomb
-            r"curl.*\|\s*(bash|sh|python|node|perl)\b",  # Download and execute
-            r"wget.*\|\s*(bash|sh|python|node|perl)\b",  # Download and execute
-            r"sudo\s+(rm|mkfs|fdisk|format|chmod\s+777)",  # Dangerous sudo commands
-            r"chmod\s+777\s+/[a-z]",  # Making system files world-writable
-            r"[>]{2,}\s*/(dev|sys|proc|etc|boot)",  # Redirecting to system files
-        ]
-
-        # Allow immediately safe patterns
-        safe_patterns = [
-            r"^(python|node|npm|pip|uv|yarn|cargo|go|java|rustc|ruby|perl|php)\b",
-            r"^(pytest|unittest|jest|test\.py|make|cmake|cargo build)",
-            r"^(git|svn|hg)\b",
-            r"^(ruff|black|isort|mypy|flake8|pylint|eslint|prettier)\b",
-            r"^(ls|cat|head|tail|grep|find|wc|cd|pwd|echo|which|whereis)\b",
-            r"^(mkdir|rmdir|cp|mv|chmod|chown)\b(?!.*(/etc|/boot|/sys|/proc|/usr/bin|/usr/lib))",
-            r"^(rm)\s+(?!-rf\s*[/.~]|-f\s*\*.*)",  # rm without dangerous wildcards or system paths
-            r"^(touch|ln|read|write|vim|nano|emacs|code)\b",
-            r"^(pip|conda|brew)\s+(install|list|show|freeze|remove|uninstall)",
-            r"^(docker|docker-compose)\s+(build|run|ps|logs|stop|start)",
-            r"^make\s+(clean|test|build|install|help)",
-        ]
-
         # Check dangerous patterns first (block these immediately)
-        for pattern in dangerous_patterns:
-            if re.search(pattern, command_stripped, re.IGNORECASE):
-                reason = "Blocked: Dangerous pattern detected"
-                logger.warning(f"Command blocked by regex: {command}")
-                return (False, reason)
-
-        # Check safe patterns (allow these immediately)
-        for pattern in safe_patterns:
-            if re.search(pattern, command_stripped, re.IGNORECASE):
-                reason = "Allowed: Recognized safe command"
-                logger.debug(f"Command allowed by regex: {command}")
-                return (True, reason)
+        match = _DANGEROUS_RE.search(command_stripped)
+        if match:
+            reason = "Blocked: Dangerous pattern detected"
+            logger.warning("Command blocked by regex (%s): %s", match.lastgroup, command)
+            return (False, reason)
+
+        # Check safe programs and patterns (allow these immediately)
+        first_word = command_stripped.split(maxsplit=1)[0].lower() if command_stripped else ""
+        if first_word in _SAFE_PROGRAMS:
+            logger.debug("Command allowed by program name (%s): %s", first_word, command)
+            return (True, "Allowed: Recognized safe command")
+
+        match = _SAFE_RE.search(command_stripped)
+        if match:
+            reason = "Allowed: Recognized safe command"
+            logger.debug("Command allowed by regex (%s): %s", match.lastgroup, command)
+            return (True, reason)
 
         # Check cache first (if enabled)
         if self.cache:
@@ -263,8 +365,43 @@ class CommandSafetyChecker:
                 self._cache_hits += 1
                 return cached_result
 
+        key = (_normalize_command(command), _normalize_working_dir(working_dir))
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            is_owner = pending is None
+            if pending is None:
+                pending = self._inflight[key] = Future()
+
+        if not is_owner:
+            # Same command is already being checked; no new LLM call, but the caller
+            # still waits out its latency, so this is not counted as a cache hit
+            self._inflight_waits += 1
+            logger.debug("Waiting for in-flight safety check: %s", command)
+            return pending.result()
+
         self._cache_misses += 1
+        try:
+            result = self._check_with_llm(command, working_dir)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
 
+    def _check_with_llm(self, command: str, working_dir: str) -> tuple[bool, str]:
+        """Ask the LLM whether a command is safe and cache the decision.
+
+        Args:
+            command: The shell command to check
+            working_dir: The working directory where the command will be executed
+
+        Returns:
+            Tuple of (is_safe: bool, reason: str)
+        """
         try:
             # Create a focused safety check prompt
             user_prompt = (
@@ -275,30 +412,25 @@ class CommandSafetyChecker:
             )
 
             # Create messages for the safety check
-            messages = [
-                {"role": "system", "content": COMMAND_SAFETY_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ]
+            messages = [_SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}]
 
-            logger.debug(f"Checking command safety: {command}")
+            logger.debug("Checking command safety: %s", command)
 
             # Get safety assessment from the LLM
-            response_dict = self.llm_provider.create_message(messages, model=self.model)
-            response = response_dict.get("content", "")
-            logger.debug(f"Safety check response: {response}")
+            response = self._read_verdict_line(messages)
+            logger.debug("Safety check response: %s", response)
 
             response = response.strip()
 
-            # Parse the response
-            if response.startswith("ALLOW:"):
-                reason = response[6:].strip() if len(response) > 6 else "Command appears safe"
-                result = (True, reason)
-            elif response.startswith("BLOCK:"):
-                reason = response[6:].strip() if len(response) > 6 else "Command deemed unsafe"
-                result = (False, reason)
+            # Parse the response, tolerating case and spacing variations of the verdict
+            match = _RESPONSE_RE.match(response)
+            if match:
+                is_safe = match.group(1).upper() == "ALLOW"
+                default_reason = "Command appears safe" if is_safe else "Command deemed unsafe"
+                result = (is_safe, match.group(2).strip() or default_reason)
             else:
                 # Unexpected response format - be permissive for development
-                logger.warning(f"Unexpected safety check response: {response}")
+                logger.warning("Unexpected safety check response: %s", response)
                 result = (True, "Unexpected response - defaulting to allow for development")
 
             # Cache the result (if cache is enabled)
@@ -307,27 +439,53 @@ class CommandSafetyChecker:
             return result
 
         except Exception as e:
-            logger.error(f"Error during safety check: {e}", exc_info=True)
+            logger.error("Error during safety check: %s", e, exc_info=True)
             # Be permissive by default - only block if we're absolutely certain it's dangerous
             # Most safety check failures should not block development workflows
-            logger.info(f"Allowing command due to safety check failure (fail-safe): {command}")
+            logger.info("Allowing command due to safety check failure (fail-safe): %s", command)
             error_result = (True, f"Safety check bypassed due to error: {str(e)}")
 
             # Don't cache error results as they might be temporary
             return error_result
 
+    def _read_verdict_line(self, messages: list[dict[str, Any]]) -> str:
+        """Stream the safety agent's reply until its first line is complete.
+
+        Only the verdict line is parsed, so the rest of the reply isn't waited for;
+        closing the stream early also stops the provider from generating it.
+
+        Args:
+            messages: Messages for the safety check
+
+        Returns:
+            The reply text received so far, starting with the verdict line
+        """
+        text = ""
+        stream = self.llm_provider.stream_message(messages, model=self.model)
+        with closing(stream) as chunks:
+            for chunk in chunks:
+                content = chunk.get("content") or ""
+                if not chunk.get("delta"):
+                    # Final chunk carries the full reply (the only one for non-streaming models)
+                    return content or text
+                text += content
+                if "\n" in text.lstrip():
+                    break
+        return text
+
     def get_cache_stats(self) -> dict[str, Any]:
         """Get cache performance statistics.
 
         Returns:
             Dictionary with cache statistics
         """
-        total_requests = self._cache_hits + self._cache_misses
+        total_requests = self._cache_hits + self._cache_misses + self._inflight_waits
         hit_rate = self._cache_hits / total_requests if total_requests > 0 else 0
 
         stats = {
             "hits": self._cache_hits,
             "misses": self._cache_misses,
+            "inflight_waits": self._inflight_waits,
             "hit_rate": hit_rate,
             "enabled": self.cache is not None,
         }
@@ -345,6 +503,7 @@ class CommandSafetyChecker:
             self.cache.clear()
         self._cache_hits = 0
         self._cache_misses = 0
+        self._inflight_waits = 0
         logger.info("Safety checker cache cleared")
 
 
@@ -1,24 +1,35 @@
 """Conversation management utilities for the agent system."""
 
+import functools
+import itertools
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Any
 
 import tiktoken
 
-from ..models import get_model_compaction_threshold
+from ..models import get_model_compaction_threshold, get_model_context_window
 from ..prompts import SYSTEM_PROMPT
 from ..providers import LLMProvider
+from ..utils import get_encoding_for_model
 
 logger = logging.getLogger(__name__)
 # Token counting constants
 DEFAULT_MAX_TOKENS = 128_000
 TOKENS_PER_MESSAGE_OVERHEAD = 4
 TOKENS_PER_NAME_FIELD = 1  # if name field present
+CHARS_PER_TOKEN_ESTIMATE = 4
+# Auto-compact at this fraction of the context window when no threshold is configured
+AUTO_COMPACT_CONTEXT_RATIO = 0.8
 
-# Cache for tiktoken encodings to avoid repeated lookups
-_encoding_cache: dict[str, tiktoken.Encoding] = {}
+# Cache of per-message token counts, keyed by message identity and validated with
+# a cheap fingerprint so edited messages are recounted
+MESSAGE_TOKEN_CACHE_SIZE = 4096
+# Minimum number of uncached messages before tokenizing them in one batch call
+BATCH_ENCODE_MIN_MESSAGES = 8
+_message_token_cache: dict[int, tuple[tuple[Any, ...], int]] = {}
 
 
 def _get_encoding(model: str) -> tiktoken.Encoding:
@@ -30,13 +41,135 @@ def _get_encoding(model: str) -> tiktoken.Encoding:
     Returns:
         tiktoken.Encoding instance for the model
     """
-    if model not in _encoding_cache:
-        try:
-            _encoding_cache[model] = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # Fall back to cl100k_base for unknown models
-            _encoding_cache[model] = tiktoken.get_encoding("cl100k_base")
-    return _encoding_cache[model]
+    return get_encoding_for_model(model)
+
+
+def _tool_calls_digest(tool_calls: list[dict[str, Any]] | None) -> int:
+    """Hash the id, function name and arguments of each tool call.
+
+    Hashing the contents rather than the list's identity means arguments edited in
+    place invalidate the cached count. Argument strings cache their hash too.
+    """
+    if not tool_calls:
+        return 0
+    parts = []
+    for call in tool_calls:
+        function = call.get("function") or {}
+        arguments = function.get("arguments")
+        if not isinstance(arguments, str):
+            arguments = json.dumps(arguments, sort_keys=True, default=str)
+        parts.append((call.get("id"), function.get("name"), arguments))
+    return hash(tuple(parts))
+
+
+def _message_fingerprint(message: dict[str, Any], encoding: tiktoken.Encoding) -> tuple[Any, ...]:
+    """Build a cheap fingerprint of the fields that contribute to a message's token count.
+
+    String hashes are cached by CPython, so for messages that have already been seen
+    this costs O(number of tool calls), regardless of content size.
+    """
+    content = message.get("content") or ""
+    return (
+        encoding.name,
+        message.get("role", ""),
+        len(content),
+        hash(content),
+        _tool_calls_digest(message.get("tool_calls")),
+    )
+
+
+def _store_message_tokens(
+    message: dict[str, Any], fingerprint: tuple[Any, ...], tokens: int
+) -> None:
+    """Store a message's token count in the bounded per-message cache."""
+    if len(_message_token_cache) >= MESSAGE_TOKEN_CACHE_SIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        del _message_token_cache[next(iter(_message_token_cache))]
+    _message_token_cache[id(message)] = (fingerprint, tokens)
+
+
+def _message_token_text(message: dict[str, Any]) -> str:
+    """Join the fields of a message that count towards its tokens into one string.
+
+    Fields are newline-separated; the tokenizer splits on newlines anyway, so
+    encoding the joined text matches encoding the fields separately to within
+    a token or so per message.
+    """
+    parts = [message.get("role", "")]
+    if message.get("content"):
+        parts.append(message["content"])
+    if message.get("tool_calls"):
+        parts.append(json.dumps(message["tool_calls"]))
+    return "\n".join(parts)
+
+
+def _count_message_tokens(message: dict[str, Any], encoding: tiktoken.Encoding) -> int:
+    """Count the role, content and tool call tokens of a single message, with caching.
+
+    Args:
+        message: Conversation message
+        encoding: tiktoken encoding to count with
+
+    Returns:
+        Number of tokens in the message (excluding formatting overhead)
+    """
+    fingerprint = _message_fingerprint(message, encoding)
+    cached = _message_token_cache.get(id(message))
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    tokens = len(encoding.encode_ordinary(_message_token_text(message)))
+    _store_message_tokens(message, fingerprint, tokens)
+    return tokens
+
+
+def _prime_message_token_cache(
+    conversation_history: list[dict[str, Any]], encoding: tiktoken.Encoding
+) -> None:
+    """Tokenize all uncached messages in one encode_ordinary_batch call.
+
+    tiktoken's batch API encodes strings on a thread pool, which pays off when many
+    messages are uncached at once (e.g. right after loading a saved conversation).
+    Small batches are left to the per-message path in _count_message_tokens.
+
+    Args:
+        conversation_history: List of conversation messages
+        encoding: tiktoken encoding to count with
+    """
+    misses: list[tuple[dict[str, Any], tuple[Any, ...]]] = []
+    for message in conversation_history:
+        fingerprint = _message_fingerprint(message, encoding)
+        cached = _message_token_cache.get(id(message))
+        if cached is None or cached[0] != fingerprint:
+            misses.append((message, fingerprint))
+
+    if len(misses) < BATCH_ENCODE_MIN_MESSAGES:
+        return
+
+    token_ids = encoding.encode_ordinary_batch(
+        [_message_token_text(message) for message, _ in misses]
+    )
+    for (message, fingerprint), ids in zip(misses, token_ids, strict=True):
+        _store_message_tokens(message, fingerprint, len(ids))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_system_prompt(doc_path: str, mtime_ns: int, size: int) -> str:
+    """Build the system prompt with an agent documentation file appended.
+
+    Cached on the file's path, modification time and size, so the file is only
+    re-read when it changes and repeated calls return the identical string.
+
+    Args:
+        doc_path: Absolute path to the agent documentation file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+        size: File size in bytes (cache key only)
+
+    Returns:
+        The system prompt with the documentation content appended
+    """
+    agents_content = Path(doc_path).read_text(encoding="utf-8")
+    return f"{SYSTEM_PROMPT}\n\nPROJECT_DOCUMENTATION:\n{agents_content}"
 
 
 def create_system_prompt() -> str:
@@ -52,16 +185,16 @@ def create_system_prompt() -> str:
     # Check for agent documentation files in order of preference
     agent_docs = ["AGENTS.md", "agents.md", "agent.md", "AGENT.md"]
     for doc_file in agent_docs:
-        doc_path = Path(doc_file)
-        if doc_path.exists():
-            try:
-                agents_content = doc_path.read_text(encoding="utf-8")
-                # Append the agent documentation content to the system prompt
-                return f"{SYSTEM_PROMPT}\n\nPROJECT_DOCUMENTATION:\n{agents_content}"
-            except (OSError, UnicodeDecodeError) as e:
-                logger.warning(f"Failed to read {doc_file}: {e}")
-                # Continue to next file if reading fails
-                continue
+        try:
+            stat = os.stat(doc_file)
+        except OSError:
+            continue
+        try:
+            return _load_system_prompt(os.path.abspath(doc_file), stat.st_mtime_ns, stat.st_size)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Failed to read {doc_file}: {e}")
+            # Continue to next file if reading fails
+            continue
 
     # Return base prompt if no documentation files exist
     return SYSTEM_PROMPT
@@ -108,43 +241,30 @@ def get_token_count(
         assistant_messages = 0
         tool_messages = 0
 
+        # Tokenize uncached messages in bulk before summing per-message counts
+        _prime_message_token_cache(conversation_history, encoding)
+
         # Count tokens in conversation history
         for message in conversation_history:
             role = message.get("role", "")
-            content = message.get("content", "")
-
-            # Count tokens in role
-            role_tokens = len(encoding.encode(role))
-            total_tokens += role_tokens
 
-            # Count tokens in content
-            content_tokens = len(encoding.encode(content)) if content else 0
-            total_tokens += content_tokens
-
-            # Count tokens in tool calls (if present)
-            tool_call_tokens = 0
-            if message.get("tool_calls"):
-                tool_call_tokens = len(encoding.encode(json.dumps(message["tool_calls"])))
-                total_tokens += tool_call_tokens
-
-            # Add overhead for message formatting (~4 tokens per message)
-            message_overhead = TOKENS_PER_MESSAGE_OVERHEAD
-            total_tokens += message_overhead
+            # Count tokens in role, content and tool calls (cached per message),
+            # plus overhead for message formatting (~4 tokens per message)
+            message_tokens = _count_message_tokens(message, encoding) + TOKENS_PER_MESSAGE_OVERHEAD
+            total_tokens += message_tokens
 
             # Categorize by role
             if role == "system":
-                system_tokens += role_tokens + content_tokens + tool_call_tokens + message_overhead
+                system_tokens += message_tokens
                 system_messages += 1
             elif role == "user":
-                user_tokens += role_tokens + content_tokens + tool_call_tokens + message_overhead
+                user_tokens += message_tokens
                 user_messages += 1
             elif role == "assistant":
-                assistant_tokens += (
-                    role_tokens + content_tokens + tool_call_tokens + message_overhead
-                )
+                assistant_tokens += message_tokens
                 assistant_messages += 1
             elif role == "tool":
-                tool_tokens += role_tokens + content_tokens + tool_call_tokens + message_overhead
+                tool_tokens += message_tokens
                 tool_messages += 1
 
         # Determine context limit for usage percent:
@@ -188,11 +308,60 @@ def get_token_count(
         }
 
 
+def estimate_token_count(conversation_history: list[dict[str, Any]]) -> int:
+    """
+    Estimate the token count of a conversation without tokenizing it.
+
+    Uses the ~4 characters per token heuristic plus the per-message overhead. This is
+    cheap enough to run on every loop iteration but can be off by 25% or more, so it
+    should only be used where an approximate answer is acceptable.
+
+    Args:
+        conversation_history: List of conversation messages
+
+    Returns:
+        Estimated number of tokens in the conversation
+    """
+    chars = 0
+    for message in conversation_history:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+        if message.get("tool_calls"):
+            chars += len(json.dumps(message["tool_calls"]))
+    return chars // CHARS_PER_TOKEN_ESTIMATE + TOKENS_PER_MESSAGE_OVERHEAD * len(
+        conversation_history
+    )
+
+
+def _token_upper_bound(conversation_history: list[dict[str, Any]]) -> int:
+    """Bound the exact token count of a conversation from above without tokenizing it.
+
+    Every BPE token covers at least one byte, so a message never has more tokens
+    than the UTF-8 length of the text it is counted from. Unlike the chars/4
+    estimate this holds for CJK text, base64 and minified JSON alike.
+
+    Args:
+        conversation_history: List of conversation messages
+
+    Returns:
+        Upper bound on the total_tokens reported by get_token_count
+
+    Raises:
+        TypeError: If a message has content that get_token_count cannot count
+    """
+    total = 0
+    for message in conversation_history:
+        total += len(_message_token_text(message).encode("utf-8")) + TOKENS_PER_MESSAGE_OVERHEAD
+    return total
+
+
 def compact_conversation(
     conversation_history: list[dict[str, Any]],
     provider: LLMProvider,
     model: str,
     keep_recent: int = 4,
+    before_stats: dict[str, Any] | None = None,
 ) -> tuple[bool, str, dict[str, Any], list[dict[str, Any]]]:
     """
     Compact conversation history by summarizing older messages.
@@ -205,6 +374,8 @@ def compact_conversation(
         provider: LLM provider instance for generating summary
         model: Model identifier to use
         keep_recent: Number of recent messages to keep intact (default: 4)
+        before_stats: Token stats for conversation_history if the caller already
+                      computed them (avoids counting the history twice)
 
     Returns:
         Tuple of (success: bool, message: str, stats: dict, new_history: list)
@@ -221,10 +392,9 @@ def compact_conversation(
             [],
         )
 
-    # Get token count before compaction
-    # We need to extract model and base_url from somewhere - they should be passed in
-    # For now, we'll use empty base_url
-    before_stats = get_token_count(conversation_history, model, None)
+    # Get token count before compaction, reusing the caller's count when available
+    if before_stats is None:
+        before_stats = get_token_count(conversation_history, model, None)
     if "error" in before_stats:
         return False, f"Error counting tokens: {before_stats['error']}", {}, []
 
@@ -233,10 +403,11 @@ def compact_conversation(
     try:
         # Separate conversation parts
         system_msg = conversation_history[0]  # Keep system prompt
-        recent_msgs = conversation_history[-keep_recent:]  # Keep recent messages
-        to_summarize = conversation_history[1:-keep_recent]  # Messages to compact
+        recent_start = len(conversation_history) - keep_recent
+        recent_msgs = conversation_history[recent_start:]  # Keep recent messages
 
-        if not to_summarize:
+        # Messages 1..recent_start are compacted
+        if recent_start <= 1:
             return False, "No messages to compact", {}, []
 
         # Create summarization prompt
@@ -253,20 +424,24 @@ Provide the summary in natural language without special formatting,
 markers, or brackets. Keep it brief but informative (aim for 200-400 words).""",
         }
 
-        # Build temporary conversation for summarization
-        summarization_conversation = [system_msg] + to_summarize + [summary_request]
+        # Build temporary conversation for summarization in a single allocation
+        summarization_conversation = [
+            system_msg,
+            *itertools.islice(conversation_history, 1, recent_start),
+            summary_request,
+        ]
 
         # Call LLM to create summary using streaming
-        response_content = ""
+        content_parts: list[str] = []
         for chunk in provider.stream_message(
             messages=summarization_conversation,
             tools=[],  # No tools needed for summarization
             model=model,
         ):
             if chunk.get("content"):
-                response_content += chunk["content"]
+                content_parts.append(chunk["content"])
 
-        response = {"content": response_content}
+        response = {"content": "".join(content_parts)}
 
         summary_content = response.get("content", "")
         if not summary_content:
@@ -286,7 +461,7 @@ markers, or brackets. Keep it brief but informative (aim for 200-400 words).""",
         }
 
         # Rebuild conversation: system + summary + recent messages
-        new_history = [system_msg, summary_msg] + recent_msgs
+        new_history = [system_msg, summary_msg, *recent_msgs]
 
         # Get token count after compaction
         after_stats = get_token_count(new_history, model, None)
@@ -303,7 +478,7 @@ markers, or brackets. Keep it brief but informative (aim for 200-400 words).""",
             "reduction_percent": reduction_percent,
             "messages_before": before_stats["message_count"],
             "messages_after": len(new_history),
-            "messages_summarized": len(to_summarize),
+            "messages_summarized": recent_start - 1,
         }
 
         success_msg = (
@@ -343,13 +518,31 @@ def check_and_auto_compact(
         If compacted is True, new_history contains the compacted conversation.
         The caller is responsible for updating their conversation history reference.
     """
-    # Get the compaction threshold for this model
+    # Get the compaction threshold for this model, falling back to its context window
     threshold = get_model_compaction_threshold(model)
+    if threshold is None:
+        context_window = get_model_context_window(model)
+        if context_window:
+            threshold = int(context_window * AUTO_COMPACT_CONTEXT_RATIO)
 
     # If no threshold is set, no auto-compaction is needed
     if threshold is None:
         return False, "No compaction threshold set for this model", {}, None
 
+    # Cheap pre-screen: skip exact tokenization while even the byte-length upper
+    # bound is below the threshold; otherwise rely on the per-message token cache
+    try:
+        max_tokens = _token_upper_bound(conversation_history)
+    except TypeError:
+        max_tokens = None
+    if max_tokens is not None and max_tokens < threshold:
+        return (
+            False,
+            f"Current tokens (at most {max_tokens:,}) below threshold ({threshold:,})",
+            {},
+            None,
+        )
+
     # Get current token count
     stats = get_token_count(conversation_history, model, base_url)
 
@@ -370,7 +563,7 @@ def check_and_auto_compact(
 
     # We're at or above the threshold, compact the conversation
     success, message, compact_stats, new_history = compact_conversation(
-        conversation_history, provider, model
+        conversation_history, provider, model, before_stats=stats
     )
 
     if success and new_history:
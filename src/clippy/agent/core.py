@@ -19,6 +19,7 @@ from ..providers import LLMProvider
 from .conversation import (
     compact_conversation,
     create_system_prompt,
+    estimate_token_count,
     get_token_count,
 )
 from .exceptions import InterruptedExceptionError
@@ -33,6 +34,10 @@ logger = logging.getLogger(__name__)
 # Type alias for approval callback
 ApprovalCallback = Callable[[str, dict[str, Any], str | None], bool]
 
+# Console shared by agents that aren't given one. Agent output is styled with explicit
+# markup, so Rich's automatic highlighting (a regex pass over every print) is disabled.
+_AGENT_CONSOLE = Console(highlight=False)
+
 # Re-export for backward compatibility
 __all__ = ["ClippyAgent", "InterruptedExceptionError", "ApprovalCallback"]
 
@@ -72,6 +77,7 @@ class ClippyAgent:
         mcp_manager: Manager | None = None,
         max_concurrent_subagents: int = 3,
         provider_config: ProviderConfig | None = None,
+        console: Console | None = None,
     ) -> None:
         """
         Initialize the ClippyAgent.
@@ -89,6 +95,7 @@ class ClippyAgent:
                              Can raise InterruptedExceptionError to stop execution.
             mcp_manager: Optional MCP manager instance for tool discovery
             max_concurrent_subagents: Maximum number of concurrent subagents
+            console: Optional console for output (defaults to a shared console)
         """
         self.permission_manager = permission_manager
         self.executor = executor
@@ -112,12 +119,14 @@ class ClippyAgent:
             )
         self.model = model
 
-        self.console = Console()
+        self.console = console or _AGENT_CONSOLE
         self.conversation_history: list[dict[str, Any]] = []
         self.interrupted = False
         self.approval_callback = approval_callback
         self.mcp_manager = mcp_manager
         self.yolo_mode = False  # YOLO mode flag
+        # Provider-reported usage of the most recent request (see _record_usage)
+        self._last_usage: dict[str, Any] | None = None
 
         # Initialize subagent manager
         self.subagent_manager = SubAgentManager(
@@ -190,15 +199,34 @@ class ClippyAgent:
             check_interrupted=lambda: self.interrupted,
             mcp_manager=self.mcp_manager,
             parent_agent=self,  # Pass self for subagent delegation
+            usage_callback=self._record_usage,
         )
         return run_agent_loop(
             conversation_history=self.conversation_history,
             config=config,
         )
 
+    def _record_usage(self, usage: dict[str, Any], message_count: int) -> None:
+        """
+        Remember the provider-reported prompt size of the latest request.
+
+        Args:
+            usage: Usage dict from the provider response
+            message_count: Number of history messages that were sent in the request
+        """
+        details = usage.get("prompt_tokens_details") or {}
+        last_sent = self.conversation_history[message_count - 1] if message_count else None
+        self._last_usage = {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "cached_tokens": details.get("cached_tokens", usage.get("cached_tokens", 0)),
+            "message_count": message_count,
+            "last_message_id": id(last_sent),
+        }
+
     def reset_conversation(self) -> None:
         """Reset the conversation history."""
         self.conversation_history = []
+        self._last_usage = None
         self.interrupted = False
         # Clear conversation start time so new conversation gets fresh timestamp
         if hasattr(self, "_conversation_start_time"):
@@ -251,6 +279,8 @@ class ClippyAgent:
             self.base_url = new_base_url
             self.model = new_model
             self.api_key = new_api_key
+            # Usage reported by the previous model does not apply to the new tokenizer
+            self._last_usage = None
 
             # Update executor's safety checker with new provider
             self.executor.set_llm_provider(self.provider, self.model)
@@ -349,6 +379,7 @@ class ClippyAgent:
             self.executor.set_llm_provider(self.provider, self.model)
 
             self.conversation_history = conversation_data.get("conversation_history", [])
+            self._last_usage = None
 
             # Restore conversation start time
             self._conversation_start_time = conversation_data.get(
@@ -410,8 +441,32 @@ class ClippyAgent:
             - assistant_messages: Number of assistant messages
             - tool_tokens: Tokens from tool messages
             - tool_messages: Number of tool messages
+
+            After a response that reported usage, also includes:
+            - provider_prompt_tokens: Prompt tokens reported by the provider
+            - cached_tokens: Prompt tokens served from the provider's prompt cache
+            - provider_context_tokens: Reported prompt tokens plus an estimate for
+              messages added since that request
         """
-        return get_token_count(self.conversation_history, self.model, self.base_url)
+        stats = get_token_count(self.conversation_history, self.model, self.base_url)
+
+        usage = self._last_usage
+        if usage is None or "error" in stats:
+            return stats
+
+        # The baseline only holds while the sent messages are still the history prefix
+        # (auto-compaction inside the loop rewrites history in place)
+        sent = usage["message_count"]
+        history = self.conversation_history
+        if sent > len(history) or (sent and id(history[sent - 1]) != usage["last_message_id"]):
+            return stats
+
+        stats["provider_prompt_tokens"] = usage["prompt_tokens"]
+        stats["cached_tokens"] = usage["cached_tokens"]
+        stats["provider_context_tokens"] = usage["prompt_tokens"] + estimate_token_count(
+            history[sent:]
+        )
+        return stats
 
     def compact_conversation(self, keep_recent: int = 4) -> tuple[bool, str, dict[str, Any]]:
         """
@@ -434,6 +489,7 @@ class ClippyAgent:
         # Update conversation history if successful
         if success and new_history:
             self.conversation_history = new_history
+            self._last_usage = None
 
         return success, message, stats
 
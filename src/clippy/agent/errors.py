@@ -14,6 +14,45 @@ from clippy.llm.errors import (
     UnprocessableEntityError,
 )
 
+# User-facing messages keyed by error class; "{error}" is replaced with the error text
+_ERROR_MESSAGES: dict[type[Exception], str] = {
+    AuthenticationError: (
+        "Authentication failed. Please check your API key.\n\n"
+        "Set OPENAI_API_KEY in your environment or .env file."
+    ),
+    RateLimitError: (
+        "Rate limit exceeded. The API has throttled your requests.\n\n"
+        "The system will automatically retry with exponential backoff."
+    ),
+    APIConnectionError: (
+        "Connection error. Failed to connect to the API.\n\n"
+        "Check your internet connection or base URL settings."
+    ),
+    APITimeoutError: (
+        "Request timeout. The API took too long to respond.\n\nThe system will automatically retry."
+    ),
+    BadRequestError: "Bad request. The API rejected the request.\n\nDetails: {error}",
+    InternalServerError: (
+        "Server error. The API encountered an internal error.\n\n"
+        "The system will automatically retry."
+    ),
+    PermissionDeniedError: (
+        "Permission denied. Your API key doesn't have permission to access "
+        "this resource.\n\n"
+        "Check your API key permissions with your provider."
+    ),
+    NotFoundError: "Resource not found. Check if the model exists.\n\nDetails: {error}",
+    ConflictError: (
+        "Conflict error. The request conflicts with the current state.\n\nDetails: {error}"
+    ),
+    UnprocessableEntityError: (
+        "Unprocessable entity. The request was well-formed but was unable to be "
+        "processed.\n\n"
+        "Details: {error}"
+    ),
+    LLMError: "API Error: {error}",
+}
+
 
 def format_api_error(error: Exception) -> str:
     """Format API errors into user-friendly messages.
@@ -24,50 +63,10 @@ def format_api_error(error: Exception) -> str:
     Returns:
         User-friendly error message string
     """
-    if isinstance(error, AuthenticationError):
-        return (
-            "Authentication failed. Please check your API key.\n\n"
-            "Set OPENAI_API_KEY in your environment or .env file."
-        )
-    elif isinstance(error, RateLimitError):
-        return (
-            "Rate limit exceeded. The API has throttled your requests.\n\n"
-            "The system will automatically retry with exponential backoff."
-        )
-    elif isinstance(error, APIConnectionError):
-        return (
-            "Connection error. Failed to connect to the API.\n\n"
-            "Check your internet connection or base URL settings."
-        )
-    elif isinstance(error, APITimeoutError):
-        return (
-            "Request timeout. The API took too long to respond.\n\n"
-            "The system will automatically retry."
-        )
-    elif isinstance(error, BadRequestError):
-        return f"Bad request. The API rejected the request.\n\nDetails: {error}"
-    elif isinstance(error, InternalServerError):
-        return (
-            "Server error. The API encountered an internal error.\n\n"
-            "The system will automatically retry."
-        )
-    elif isinstance(error, PermissionDeniedError):
-        return (
-            "Permission denied. Your API key doesn't have permission to access "
-            "this resource.\n\n"
-            "Check your API key permissions with your provider."
-        )
-    elif isinstance(error, NotFoundError):
-        return f"Resource not found. Check if the model exists.\n\nDetails: {error}"
-    elif isinstance(error, ConflictError):
-        return f"Conflict error. The request conflicts with the current state.\n\nDetails: {error}"
-    elif isinstance(error, UnprocessableEntityError):
-        return (
-            "Unprocessable entity. The request was well-formed but was unable to be "
-            "processed.\n\n"
-            f"Details: {error}"
-        )
-    elif isinstance(error, LLMError):
-        return f"API Error: {error}"
-    else:
-        return f"{type(error).__name__}: {error}"
+    # Walk the MRO so the most specific registered error class wins
+    for error_class in type(error).__mro__:
+        template = _ERROR_MESSAGES.get(error_class)
+        if template is not None:
+            return template.format(error=error)
+
+    return f"{type(error).__name__}: {error}"
@@ -5,6 +5,7 @@ import logging
 import sys
 import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
@@ -12,7 +13,7 @@ from rich.markup import escape
 from rich.panel import Panel
 
 from ..executor import ActionExecutor
-from ..permissions import PermissionManager
+from ..permissions import TOOL_ACTION_MAP, ActionType, PermissionManager
 from ..providers import LLMProvider, Spinner
 from ..tools import catalog as tool_catalog
 from .conversation import check_and_auto_compact
@@ -30,6 +31,18 @@ logger = logging.getLogger(__name__)
 # Loop constants
 DEFAULT_MAX_ITERATIONS = 100
 
+# Read-only actions whose tool calls may run concurrently within a single turn
+PARALLEL_SAFE_ACTIONS = frozenset(
+    {
+        ActionType.READ_FILE,
+        ActionType.LIST_DIR,
+        ActionType.SEARCH_FILES,
+        ActionType.GET_FILE_INFO,
+        ActionType.GREP,
+    }
+)
+MAX_PARALLEL_TOOL_WORKERS = 4
+
 
 @dataclass
 class AgentLoopConfig:
@@ -52,6 +65,7 @@ class AgentLoopConfig:
     parent_agent: AgentProtocol | None = None
     max_iterations: int | None = DEFAULT_MAX_ITERATIONS
     max_duration: float | None = None
+    usage_callback: Callable[[dict[str, Any], int], None] | None = None
 
 
 def run_agent_loop(
@@ -158,6 +172,9 @@ def run_agent_loop(
 
             # Track token usage from this API call
             if response.get("usage"):
+                if config.usage_callback:
+                    config.usage_callback(response["usage"], len(conversation_history))
+
                 from .token_tracker import get_session_tracker
 
                 tracker = get_session_tracker()
@@ -188,18 +205,15 @@ def run_agent_loop(
             logger.error(f"API error in agent loop: {type(e).__name__}: {e}", exc_info=True)
             raise
 
-        # Build assistant message for history
-        assistant_message: dict[str, Any] = {
-            "role": "assistant",
-        }
-
-        # Add content if present
-        if response.get("content"):
-            assistant_message["content"] = response["content"]
+        content = response.get("content")
+        tool_calls = response.get("tool_calls")
 
-        # Add tool calls if present
-        if response.get("tool_calls"):
-            assistant_message["tool_calls"] = response["tool_calls"]
+        # Build assistant message for history
+        assistant_message: dict[str, Any] = {"role": "assistant"}
+        if content:
+            assistant_message["content"] = content
+        if tool_calls:
+            assistant_message["tool_calls"] = tool_calls
 
         # Preserve reasoning_content for reasoner models
         if response.get("reasoning_content"):
@@ -216,67 +230,70 @@ def run_agent_loop(
             if not success:
                 logger.warning(f"Failed to auto-save conversation: {message}")
 
-        # Handle tool calls
-        has_tool_calls = False
-        if response.get("tool_calls"):
-            has_tool_calls = True
-            num_tool_calls = len(response["tool_calls"])
-            logger.info(f"Processing {num_tool_calls} tool call(s) in iteration {iteration}")
-
-            for tool_call in response["tool_calls"]:
-                tool_name = tool_call["function"]["name"]
-                logger.debug(f"Processing tool call: {tool_name}")
-
-                # Parse tool arguments (JSON string -> dict)
-                try:
-                    tool_input = json.loads(tool_call["function"]["arguments"])
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse tool arguments for {tool_name}: {e}")
-                    config.console.print(
-                        f"[bold red]Error parsing tool arguments: {escape(str(e))}[/bold red]"
-                    )
-                    from .tool_handler import add_tool_result
-
-                    add_tool_result(
-                        conversation_history,
-                        tool_call["id"],
-                        False,
-                        f"Error parsing tool arguments: {e}",
-                        None,
-                        tool_name=tool_name,
-                    )
-                    continue
-
-                success = handle_tool_use(
-                    tool_name,
-                    tool_input,
-                    tool_call["id"],
-                    config.auto_approve_all,
-                    config.permission_manager,
-                    config.executor,
-                    config.console,
-                    conversation_history,
-                    config.approval_callback,
-                    config.mcp_manager,
-                    config.parent_agent,
-                )
-                if not success:
-                    logger.warning(f"Tool execution failed or denied: {tool_name}")
-                    # Tool execution failed or was denied
-                    continue
-                else:
-                    logger.info(f"Tool executed successfully: {tool_name}")
-
         # If no tool calls, we're done
-        if not has_tool_calls:
+        if not tool_calls:
             logger.info(f"Agent loop completed successfully after {iteration} iteration(s)")
-            content = response.get("content", "")
             return content if isinstance(content, str) else ""
 
-        # Check finish reason
+        logger.info(f"Processing {len(tool_calls)} tool call(s) in iteration {iteration}")
+
+        # Runs of consecutive auto-approved read-only calls execute concurrently
+        # when the loop reaches them; everything else stays serial and in order
+        parallel_runs = _find_parallel_runs(tool_calls, config)
+        prefetched: dict[int, tuple[bool, str, Any]] = {}
+
+        for index, tool_call in enumerate(tool_calls):
+            if index in parallel_runs:
+                prefetched.update(
+                    _execute_tool_calls_concurrently(parallel_runs[index], config.executor)
+                )
+
+            tool_name = tool_call["function"]["name"]
+            logger.debug(f"Processing tool call: {tool_name}")
+
+            # Parse tool arguments (JSON string -> dict)
+            try:
+                tool_input = json.loads(tool_call["function"]["arguments"])
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse tool arguments for {tool_name}: {e}")
+                config.console.print(
+                    f"[bold red]Error parsing tool arguments: {escape(str(e))}[/bold red]"
+                )
+                from .tool_handler import add_tool_result
+
+                add_tool_result(
+                    conversation_history,
+                    tool_call["id"],
+                    False,
+                    f"Error parsing tool arguments: {e}",
+                    None,
+                    tool_name=tool_name,
+                )
+                continue
+
+            success = handle_tool_use(
+                tool_name,
+                tool_input,
+                tool_call["id"],
+                config.auto_approve_all,
+                config.permission_manager,
+                config.executor,
+                config.console,
+                conversation_history,
+                config.approval_callback,
+                config.mcp_manager,
+                config.parent_agent,
+                prefetched_result=prefetched.pop(index, None),
+            )
+            if not success:
+                # Tool execution failed or was denied
+                logger.warning(f"Tool execution failed or denied: {tool_name}")
+            else:
+                logger.info(f"Tool executed successfully: {tool_name}")
+
+        # Some providers report finish_reason=stop alongside tool calls
         if response.get("finish_reason") == "stop":
             logger.info(f"Agent loop stopped (finish_reason=stop) after {iteration} iteration(s)")
-            content = response.get("content", "")
             return content if isinstance(content, str) else ""
 
         # Start spinner for next iteration (since we're continuing the loop)
@@ -286,6 +303,97 @@ def run_agent_loop(
     # Note: No maximum iterations limit - loop runs until agent completes or is interrupted
 
 
+def _parallel_safe_input(
+    tool_call: dict[str, Any], config: AgentLoopConfig
+) -> dict[str, Any] | None:
+    """
+    Return parsed arguments if a tool call can run concurrently with its neighbours.
+
+    A call qualifies when it is a built-in read-only tool that will execute without
+    prompting the user (auto-approved, auto_approve_all, or YOLO mode) and its
+    arguments parse to a dict.
+
+    Args:
+        tool_call: Tool call from the assistant response
+        config: Agent loop configuration
+
+    Returns:
+        Parsed tool input, or None if the call must run serially
+    """
+    action_type = TOOL_ACTION_MAP.get(tool_call["function"]["name"])
+    if action_type not in PARALLEL_SAFE_ACTIONS:
+        return None
+
+    permissions = config.permission_manager.config
+    if permissions.is_denied(action_type):
+        return None
+    yolo_mode = config.parent_agent is not None and config.parent_agent.yolo_mode
+    if not (config.auto_approve_all or yolo_mode or permissions.can_auto_execute(action_type)):
+        return None
+
+    try:
+        tool_input = json.loads(tool_call["function"]["arguments"])
+    except json.JSONDecodeError:
+        return None
+    return tool_input if isinstance(tool_input, dict) else None
+
+
+def _find_parallel_runs(
+    tool_calls: list[dict[str, Any]], config: AgentLoopConfig
+) -> dict[int, list[tuple[int, str, dict[str, Any]]]]:
+    """
+    Group consecutive parallel-safe tool calls into runs.
+
+    Runs are bounded by any call that is not parallel-safe, so reads never overtake
+    a write (or an approval prompt) that precedes them in the same turn.
+
+    Args:
+        tool_calls: Tool calls from the assistant response
+        config: Agent loop configuration
+
+    Returns:
+        Mapping of run start index to the (index, tool_name, tool_input) entries in the
+        run. Only runs with at least two calls are included.
+    """
+    runs: dict[int, list[tuple[int, str, dict[str, Any]]]] = {}
+    current: list[tuple[int, str, dict[str, Any]]] = []
+
+    for index, tool_call in enumerate(tool_calls):
+        tool_input = _parallel_safe_input(tool_call, config)
+        if tool_input is not None:
+            current.append((index, tool_call["function"]["name"], tool_input))
+            continue
+        if len(current) > 1:
+            runs[current[0][0]] = current
+        current = []
+
+    if len(current) > 1:
+        runs[current[0][0]] = current
+    return runs
+
+
+def _execute_tool_calls_concurrently(
+    run: list[tuple[int, str, dict[str, Any]]], executor: ActionExecutor
+) -> dict[int, tuple[bool, str, Any]]:
+    """
+    Execute a run of read-only tool calls on a thread pool.
+
+    Args:
+        run: (index, tool_name, tool_input) entries to execute
+        executor: Action executor instance
+
+    Returns:
+        Mapping of tool call index to its (success, message, result) tuple
+    """
+    logger.debug(f"Executing {len(run)} read-only tool calls concurrently")
+    with ThreadPoolExecutor(max_workers=min(len(run), MAX_PARALLEL_TOOL_WORKERS)) as pool:
+        futures = {
+            index: pool.submit(executor.execute, tool_name, tool_input)
+            for index, tool_name, tool_input in run
+        }
+    return {index: future.result() for index, future in futures.items()}
+
+
 def _process_streaming_response(
     provider: LLMProvider,
     conversation_history: list[dict[str, Any]],
@@ -312,8 +420,18 @@ def _process_streaming_response(
     # Track accumulated content and tool calls
     accumulated_content = ""
     accumulated_tool_calls: list[dict[str, Any]] = []
+    finish_reason: str | None = None
+    usage: dict[str, Any] | None = None
 
     for chunk in provider.stream_message(conversation_history, tools, model):
+        # Final chunks carry the complete tool calls, finish reason and usage
+        if chunk.get("tool_calls"):
+            accumulated_tool_calls = chunk["tool_calls"]
+        if chunk.get("finish_reason"):
+            finish_reason = chunk["finish_reason"]
+        if chunk.get("usage"):
+            usage = chunk["usage"]
+
         # Handle streaming content deltas
         if chunk.get("delta") and chunk.get("content"):
             # Print the chunk directly for real-time display
@@ -345,6 +463,7 @@ def _process_streaming_response(
                 "content": accumulated_content if accumulated_content else None,
                 "tool_calls": accumulated_tool_calls if accumulated_tool_calls else None,
                 "finish_reason": chunk.get("finish_reason"),
+                "usage": usage,
             }
 
     # If we get here, return what we accumulated
@@ -352,7 +471,8 @@ def _process_streaming_response(
         "role": "assistant",
         "content": accumulated_content if accumulated_content else None,
         "tool_calls": accumulated_tool_calls if accumulated_tool_calls else None,
-        "finish_reason": "stop",
+        "finish_reason": finish_reason or "stop",
+        "usage": usage,
     }
 
 
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import TYPE_CHECKING, Any
 
@@ -64,6 +65,8 @@ class SubAgentManager:
         # Track active subagents
         self.active_subagents: dict[str, SubAgent] = {}
         self.completed_subagents: list[SubAgent] = []
+        self.completed_by_name: dict[str, SubAgent] = {}
+        self._stats = self._empty_stats()
 
         # Initialize advanced features
         self._cache = None
@@ -134,6 +137,42 @@ class SubAgentManager:
         logger.info(f"Created subagent '{config.name}' of type '{config.subagent_type}'")
         return subagent
 
+    @staticmethod
+    def _empty_stats() -> dict[str, Any]:
+        """Return zeroed running totals for completed subagents."""
+        return {
+            "successful": 0,
+            "failed": 0,
+            "total_exec_time": 0.0,
+            "exec_time_count": 0,
+            "total_iterations": 0,
+        }
+
+    def _mark_completed(self, subagent: SubAgent, result: SubAgentResult | None) -> None:
+        """
+        Move a subagent from the active set to the completed history.
+
+        Also folds its result into the running totals reported by get_statistics.
+
+        Args:
+            subagent: Subagent that has finished running
+            result: Result the subagent produced, or None if it never finished
+        """
+        name = subagent.config.name
+        self.active_subagents.pop(name, None)
+        self.completed_subagents.append(subagent)
+        self.completed_by_name[name] = subagent
+
+        if result and result.success:
+            self._stats["successful"] += 1
+        else:
+            self._stats["failed"] += 1
+        if result:
+            if result.execution_time > 0:
+                self._stats["total_exec_time"] += result.execution_time
+                self._stats["exec_time_count"] += 1
+            self._stats["total_iterations"] += result.iterations_used
+
     def run_sequential(self, subagents: list[SubAgent]) -> list[Any]:
         """
         Run multiple subagents sequentially.
@@ -152,10 +191,7 @@ class SubAgentManager:
             result = subagent.run()
             results.append(result)
 
-            # Move from active to completed
-            if subagent.config.name in self.active_subagents:
-                del self.active_subagents[subagent.config.name]
-            self.completed_subagents.append(subagent)
+            self._mark_completed(subagent, result)
 
         return results
 
@@ -176,8 +212,40 @@ class SubAgentManager:
         Returns:
             List of results in the same order as input
         """
+        results: list[Any] = [None] * len(subagents)
+        for index, result in self.run_parallel_iter(
+            subagents, max_concurrent, stuck_detection_config
+        ):
+            results[index] = result
+        return results
+
+    def run_parallel_iter(
+        self,
+        subagents: list[SubAgent],
+        max_concurrent: int | None = None,
+        stuck_detection_config: StuckDetectionConfig | None = None,
+    ) -> Iterator[tuple[int, Any]]:
+        """
+        Run multiple subagents in parallel, yielding results as they complete.
+
+        Lets callers act on early finishers instead of waiting for the slowest
+        subagent. Subagents that fail or are cancelled yield an error result.
+
+        If the caller stops iterating early (break, exception or close()), the
+        iterator still waits for the subagents already submitted to finish. It
+        records them as completed, so they appear in get_statistics and
+        get_subagent_status, but their results are not yielded.
+
+        Args:
+            subagents: List of subagents to run
+            max_concurrent: Maximum concurrent subagents (overrides instance default)
+            stuck_detection_config: Configuration for stuck subagent detection
+
+        Yields:
+            Tuples of (index into subagents, result) in completion order
+        """
         if not subagents:
-            return []
+            return
 
         max_workers = max_concurrent or self.max_concurrent
         if len(subagents) < max_workers:
@@ -201,168 +269,193 @@ class SubAgentManager:
         # Use ThreadPoolExecutor for parallel execution
         results: list[Any] = [None] * len(subagents)  # Pre-allocate results list
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Start monitoring if enabled
-            if use_monitoring and monitor:
-                # Set monitor for each subagent (if they support heartbeat)
-                for subagent in subagents:
-                    if hasattr(subagent, "set_monitor"):
-                        subagent.set_monitor(monitor)
-
-                monitor.start_monitoring(subagents)
-
-            try:
-                # Submit all subagent tasks
-                future_to_index = {}
-                for i, subagent in enumerate(subagents):
-                    logger.info(
-                        f"Submitting subagent '{subagent.config.name}' for parallel execution"
+        future_to_index: dict[Any, int] = {}
+        exhausted = False
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Start monitoring if enabled
+                if use_monitoring and monitor:
+                    # Set monitor for each subagent (if they support heartbeat)
+                    for subagent in subagents:
+                        if hasattr(subagent, "set_monitor"):
+                            subagent.set_monitor(monitor)
+
+                    monitor.start_monitoring(subagents)
+
+                try:
+                    # Submit all subagent tasks
+                    for i, subagent in enumerate(subagents):
+                        logger.info(
+                            f"Submitting subagent '{subagent.config.name}' for parallel execution"
+                        )
+                        future = executor.submit(subagent.run)
+                        future_to_index[future] = i
+
+                    # Collect results as they complete with timeout for stuck detection
+                    if use_monitoring and monitor and stuck_detection_config:
+                        # Use a shorter timeout with monitoring to check for stuck subagents
+                        collection_start_time = time.time()
+                        max_collection_time = stuck_detection_config.overall_timeout
+
+                        completed_futures: set[Any] = set()
+                        while len(completed_futures) < len(future_to_index):
+                            # Check overall timeout
+                            if time.time() - collection_start_time > max_collection_time:
+                                logger.warning("Parallel execution exceeded overall timeout")
+                                # Cancel remaining futures
+                                for future in set(future_to_index.keys()) - completed_futures:
+                                    future.cancel()
+                                break
+
+                            # Wait for at least future to complete or timeout check
+                            try:
+                                completed = as_completed(
+                                    set(future_to_index.keys()) - completed_futures,
+                                    timeout=30.0,  # Check every 30 seconds
+                                )
+                                for future in completed:
+                                    index = future_to_index[future]
+                                    subagent = subagents[index]
+
+                                    try:
+                                        result = future.result()
+                                        results[index] = result
+                                        logger.info(
+                                            f"Subagent '{subagent.config.name}' completed: "
+                                            f"{result.success}"
+                                        )
+
+                                        # Update monitor
+                                        if monitor:
+                                            monitor.mark_completed(subagent.config.name, result)
+
+                                    except Exception as e:
+                                        logger.error(
+                                            f"Subagent '{subagent.config.name}' failed with "
+                                            f"exception: {e}"
+                                        )
+
+                                        results[index] = SubAgentResult(
+                                            success=False,
+                                            output="",
+                                            error=f"Subagent execution failed: {str(e)}",
+                                            iterations_used=0,
+                                            execution_time=0.0,
+                                            metadata={
+                                                "subagent_name": subagent.config.name,
+                                                "subagent_type": subagent.config.subagent_type,
+                                                "failure_reason": "exception",
+                                            },
+                                        )
+
+                                    self._mark_completed(subagent, results[index])
+                                    completed_futures.add(future)
+                                    yield index, results[index]
+
+                            except TimeoutError:
+                                # Check for stuck subagents
+                                if monitor:
+                                    stuck = monitor.get_stuck_subagents()
+                                    if stuck:
+                                        logger.warning(f"Detected stuck subagents: {stuck}")
+                                        # Let the monitor handle them, continue waiting
+                                        continue
+
+                                # No stuck subagents, continue waiting
+                                continue
+                    else:
+                        # Traditional collection without monitoring
+                        for future in as_completed(future_to_index):
+                            index = future_to_index[future]
+                            subagent = subagents[index]
+
+                            try:
+                                result = future.result()
+                                results[index] = result
+                                logger.info(
+                                    f"Subagent '{subagent.config.name}' completed: {result.success}"
+                                )
+
+                                # Update monitor if available
+                                if monitor:
+                                    monitor.mark_completed(subagent.config.name, result)
+
+                            except (RuntimeError, ValueError, KeyError, AttributeError) as e:
+                                logger.error(
+                                    f"Subagent '{subagent.config.name}' failed with exception: {e}"
+                                )
+
+                                results[index] = SubAgentResult(
+                                    success=False,
+                                    output="",
+                                    error=f"Subagent execution failed: {str(e)}",
+                                    iterations_used=0,
+                                    execution_time=0.0,
+                                    metadata={
+                                        "subagent_name": subagent.config.name,
+                                        "subagent_type": subagent.config.subagent_type,
+                                        "failure_reason": "exception",
+                                    },
+                                )
+
+                            self._mark_completed(subagent, results[index])
+                            yield index, results[index]
+
+                finally:
+                    # Stop monitoring and get statistics
+                    if monitor:
+                        monitor_stats = monitor.stop_monitoring()
+                        logger.info(f"Subagent monitoring completed: {monitor_stats}")
+
+            # Fill any remaining None results (typically due to cancellation)
+            for i, result in enumerate(results):
+                if result is None:
+                    subagent = subagents[i]
+                    results[i] = SubAgentResult(
+                        success=False,
+                        output="",
+                        error="Subagent execution was cancelled or did not complete",
+                        iterations_used=0,
+                        execution_time=0.0,
+                        metadata={
+                            "subagent_name": subagent.config.name,
+                            "subagent_type": subagent.config.subagent_type,
+                            "failure_reason": "cancelled",
+                        },
                     )
-                    future = executor.submit(subagent.run)
-                    future_to_index[future] = i
-
-                # Collect results as they complete with timeout for stuck detection
-                if use_monitoring and monitor and stuck_detection_config:
-                    # Use a shorter timeout with monitoring to check for stuck subagents
-                    collection_start_time = time.time()
-                    max_collection_time = stuck_detection_config.overall_timeout
-
-                    completed_futures: set[Any] = set()
-                    while len(completed_futures) < len(future_to_index):
-                        # Check overall timeout
-                        if time.time() - collection_start_time > max_collection_time:
-                            logger.warning("Parallel execution exceeded overall timeout")
-                            # Cancel remaining futures
-                            for future in set(future_to_index.keys()) - completed_futures:
-                                future.cancel()
-                            break
-
-                        # Wait for at least future to complete or timeout check
-                        try:
-                            completed = as_completed(
-                                set(future_to_index.keys()) - completed_futures,
-                                timeout=30.0,  # Check every 30 seconds
-                            )
-                            for future in completed:
-                                index = future_to_index[future]
-                                subagent = subagents[index]
-
-                                try:
-                                    result = future.result()
-                                    results[index] = result
-                                    logger.info(
-                                        f"Subagent '{subagent.config.name}' completed: "
-                                        f"{result.success}"
-                                    )
-
-                                    # Update monitor
-                                    if monitor:
-                                        monitor.mark_completed(subagent.config.name, result)
-
-                                except Exception as e:
-                                    logger.error(
-                                        f"Subagent '{subagent.config.name}' failed with "
-                                        f"exception: {e}"
-                                    )
-
-                                    results[index] = SubAgentResult(
-                                        success=False,
-                                        output="",
-                                        error=f"Subagent execution failed: {str(e)}",
-                                        iterations_used=0,
-                                        execution_time=0.0,
-                                        metadata={
-                                            "subagent_name": subagent.config.name,
-                                            "subagent_type": subagent.config.subagent_type,
-                                            "failure_reason": "exception",
-                                        },
-                                    )
-
-                                # Move from active to completed
-                                if subagent.config.name in self.active_subagents:
-                                    del self.active_subagents[subagent.config.name]
-                                self.completed_subagents.append(subagent)
-                                completed_futures.add(future)
-
-                        except TimeoutError:
-                            # Check for stuck subagents
-                            if monitor:
-                                stuck = monitor.get_stuck_subagents()
-                                if stuck:
-                                    logger.warning(f"Detected stuck subagents: {stuck}")
-                                    # Let the monitor handle them, continue waiting
-                                    continue
-
-                            # No stuck subagents, continue waiting
-                            continue
-                else:
-                    # Traditional collection without monitoring
-                    for future in as_completed(future_to_index):
-                        index = future_to_index[future]
-                        subagent = subagents[index]
-
-                        try:
-                            result = future.result()
-                            results[index] = result
-                            logger.info(
-                                f"Subagent '{subagent.config.name}' completed: {result.success}"
-                            )
-
-                            # Update monitor if available
-                            if monitor:
-                                monitor.mark_completed(subagent.config.name, result)
-
-                        except (RuntimeError, ValueError, KeyError, AttributeError) as e:
-                            logger.error(
-                                f"Subagent '{subagent.config.name}' failed with exception: {e}"
-                            )
-
-                            results[index] = SubAgentResult(
-                                success=False,
-                                output="",
-                                error=f"Subagent execution failed: {str(e)}",
-                                iterations_used=0,
-                                execution_time=0.0,
-                                metadata={
-                                    "subagent_name": subagent.config.name,
-                                    "subagent_type": subagent.config.subagent_type,
-                                    "failure_reason": "exception",
-                                },
-                            )
-
-                        # Move from active to completed
-                        if subagent.config.name in self.active_subagents:
-                            del self.active_subagents[subagent.config.name]
-                        self.completed_subagents.append(subagent)
-
-            finally:
-                # Stop monitoring and get statistics
-                if monitor:
-                    monitor_stats = monitor.stop_monitoring()
-                    logger.info(f"Subagent monitoring completed: {monitor_stats}")
-
-        # Fill any remaining None results (typically due to cancellation)
-        for i, result in enumerate(results):
-            if result is None:
-                subagent = subagents[i]
-                results[i] = SubAgentResult(
-                    success=False,
-                    output="",
-                    error="Subagent execution was cancelled or did not complete",
-                    iterations_used=0,
-                    execution_time=0.0,
-                    metadata={
-                        "subagent_name": subagent.config.name,
-                        "subagent_type": subagent.config.subagent_type,
-                        "failure_reason": "cancelled",
-                    },
-                )
-                # Move to completed if not already there
-                if subagent.config.name in self.active_subagents:
-                    del self.active_subagents[subagent.config.name]
-                self.completed_subagents.append(subagent)
+                    self._mark_completed(subagent, results[i])
+                    yield i, results[i]
+            exhausted = True
+        finally:
+            if not exhausted:
+                # The caller stopped iterating early. Leaving the with-block above has
+                # already waited for the running subagents, so record every one whose
+                # result was not yielded as completed.
+                self._mark_unyielded_completed(subagents, results, future_to_index)
+
+    def _mark_unyielded_completed(
+        self,
+        subagents: list[SubAgent],
+        results: list[Any],
+        future_to_index: dict[Any, int],
+    ) -> None:
+        """
+        Record subagents whose results run_parallel_iter never yielded as completed.
 
-        return results
+        Args:
+            subagents: Subagents passed to run_parallel_iter
+            results: Results collected so far (None where nothing was yielded)
+            future_to_index: Submitted futures mapped to their subagent index
+        """
+        index_to_future = {index: future for future, index in future_to_index.items()}
+        for i, subagent in enumerate(subagents):
+            if results[i] is not None:
+                continue
+            future = index_to_future.get(i)
+            result = None
+            if future and future.done() and not future.cancelled() and not future.exception():
+                result = future.result()
+            self._mark_completed(subagent, result)
 
     def get_active_subagents(self) -> list[SubAgent]:
         """
@@ -387,10 +480,9 @@ class SubAgentManager:
         if subagent:
             return subagent.get_status()
 
-        # Check completed subagents
-        for completed in self.completed_subagents:
-            if completed.config.name == name:
-                return completed.get_status()
+        completed = self.completed_by_name.get(name)
+        if completed:
+            return completed.get_status()
 
         return None
 
@@ -434,37 +526,29 @@ class SubAgentManager:
         Returns:
             Dictionary with execution statistics
         """
-        total_completed = len(self.completed_subagents)
-        successful = sum(1 for s in self.completed_subagents if s.result and s.result.success)
-        failed = total_completed - successful
-
-        # Calculate average execution time
-        execution_times = [
-            s.result.execution_time
-            for s in self.completed_subagents
-            if s.result and s.result.execution_time > 0
-        ]
-        avg_execution_time = sum(execution_times) / len(execution_times) if execution_times else 0
-
-        # Calculate total iterations
-        total_iterations = sum(
-            s.result.iterations_used for s in self.completed_subagents if s.result
-        )
+        stats = self._stats
+        successful = stats["successful"]
+        total_completed = successful + stats["failed"]
+        exec_time_count = stats["exec_time_count"]
 
         return {
             "active_count": len(self.active_subagents),
             "completed_count": total_completed,
             "successful_count": successful,
-            "failed_count": failed,
+            "failed_count": stats["failed"],
             "success_rate": successful / total_completed if total_completed > 0 else 0,
-            "avg_execution_time": avg_execution_time,
-            "total_iterations": total_iterations,
+            "avg_execution_time": (
+                stats["total_exec_time"] / exec_time_count if exec_time_count else 0
+            ),
+            "total_iterations": stats["total_iterations"],
             "max_concurrent": self.max_concurrent,
         }
 
     def clear_completed(self) -> None:
         """Clear the list of completed subagents to free memory."""
         self.completed_subagents.clear()
+        self.completed_by_name.clear()
+        self._stats = self._empty_stats()
         logger.info("Cleared completed subagents list")
 
     def set_max_concurrent(self, max_concurrent: int) -> None:
@@ -509,19 +593,20 @@ class SubAgentManager:
         )
 
         # Use asyncio to run subagent tasks in parallel
+        loop = asyncio.get_running_loop()
         semaphore = asyncio.Semaphore(max_workers)
 
         async def run_single_subagent(subagent: SubAgent) -> Any:
             async with semaphore:
                 # Run the synchronous subagent.run() in a thread pool
-                loop = asyncio.get_event_loop()
+                result: SubAgentResult | None = None
                 try:
                     result = await loop.run_in_executor(None, subagent.run)
                     return result
                 except Exception as e:
                     logger.error(f"Async subagent '{subagent.config.name}' failed: {e}")
 
-                    return SubAgentResult(
+                    result = SubAgentResult(
                         success=False,
                         output="",
                         error=f"Async subagent execution failed: {str(e)}",
@@ -533,11 +618,9 @@ class SubAgentManager:
                             "failure_reason": "exception",
                         },
                     )
+                    return result
                 finally:
-                    # Move from active to completed
-                    if subagent.config.name in self.active_subagents:
-                        del self.active_subagents[subagent.config.name]
-                    self.completed_subagents.append(subagent)
+                    self._mark_completed(subagent, result)
 
         # Run all subagents concurrently
         tasks = [run_single_subagent(subagent) for subagent in subagents]
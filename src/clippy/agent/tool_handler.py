@@ -1,7 +1,9 @@
 """Tool handling utilities for the agent system."""
 
+import asyncio
+import inspect
 import logging
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from rich.markup import escape
@@ -22,6 +24,9 @@ from .utils import generate_preview_diff
 
 logger = logging.getLogger(__name__)
 
+# Input values longer than this are shortened when a diff already previews the change
+MAX_TOOL_INPUT_PREVIEW_CHARS = 200
+
 
 def format_mcp_result(result: Any) -> str:
     """
@@ -93,7 +98,16 @@ def display_tool_request(
     else:
         console.print(f"\n[bold cyan]→ {tool_name}[/bold cyan]")
 
-    input_str = "\n".join(f"  {k}: {escape(str(v))}" for k, v in tool_input.items())
+    # When a diff previews the change, large inputs (e.g. write_file content) are
+    # shortened so they aren't rendered and markup-escaped in full a second time
+    lines = []
+    for key, value in tool_input.items():
+        text = str(value)
+        if diff_content is not None and len(text) > MAX_TOOL_INPUT_PREVIEW_CHARS:
+            hidden = len(text) - MAX_TOOL_INPUT_PREVIEW_CHARS
+            text = f"{text[:MAX_TOOL_INPUT_PREVIEW_CHARS]}… (+{hidden:,} chars)"
+        lines.append(f"  {key}: {escape(text)}")
+    input_str = "\n".join(lines)
     if input_str:
         console.print(f"[cyan]{input_str}[/cyan]")
 
@@ -130,6 +144,7 @@ def handle_tool_use(
     approval_callback: Callable[[str, dict[str, Any], str | None], bool] | None = None,
     mcp_manager: Any = None,
     parent_agent: AgentProtocol | None = None,
+    prefetched_result: tuple[bool, str, Any] | None = None,
 ) -> bool:
     """
     Handle a tool use request.
@@ -145,6 +160,8 @@ def handle_tool_use(
         conversation_history: Current conversation history (modified in place)
         approval_callback: Optional callback for approval (used in document mode)
         mcp_manager: Optional MCP manager for trusting MCP servers
+        prefetched_result: Result of an execution that already ran (e.g. concurrently
+                           with other read-only calls); skips executing the tool again
 
     Returns:
         True if the tool was executed successfully, False otherwise
@@ -261,8 +278,10 @@ def handle_tool_use(
     # For MCP tools, bypass trust check if user explicitly approved
     bypass_trust = user_approved and is_mcp_tool(tool_name)
     logger.debug(f"Executing tool: {tool_name}, bypass_trust: {bypass_trust}")
+    if prefetched_result is not None:
+        success, message, result = prefetched_result
     # Special handling for delegate_to_subagent
-    if tool_name == "delegate_to_subagent":
+    elif tool_name == "delegate_to_subagent":
         if parent_agent is None:
             success, message, result = (
                 False,
@@ -470,6 +489,61 @@ def ask_approval(
             raise InterruptedExceptionError()
 
 
+async def ask_approval_async(
+    tool_name: str,
+    tool_input: dict[str, Any],
+    diff_content: str | None,
+    action_type: ActionType | None,
+    permission_manager: PermissionManager,
+    console: ConsoleProtocol,
+    approval_callback: Callable[[str, dict[str, Any], str | None], bool | Awaitable[bool]]
+    | None = None,
+    mcp_manager: Any = None,
+) -> bool:
+    """
+    Ask user for approval without blocking the running event loop.
+
+    An approval callback is called directly and its result is awaited whenever it is
+    awaitable, so async functions, lambdas or partials wrapping them, and objects with
+    an async __call__ are all honoured. Without a callback, the interactive input()
+    prompt runs in a worker thread via asyncio.to_thread, so other tasks on the loop
+    keep running while the user decides.
+
+    Args:
+        tool_name: Name of the tool
+        tool_input: Tool input parameters
+        diff_content: Optional diff content for file operations
+        action_type: Type of action being requested
+        permission_manager: Permission manager instance
+        console: Rich console instance
+        approval_callback: Optional sync or async callback for approval
+        mcp_manager: Optional MCP manager for trusting MCP servers
+
+    Returns:
+        True if approved, False otherwise
+
+    Raises:
+        InterruptedExceptionError: If user interrupts execution
+    """
+    if approval_callback:
+        result = approval_callback(tool_name, tool_input, diff_content)
+        if inspect.isawaitable(result):
+            result = await result
+        return bool(result)
+
+    return await asyncio.to_thread(
+        ask_approval,
+        tool_name,
+        tool_input,
+        diff_content,
+        action_type,
+        permission_manager,
+        console,
+        None,
+        mcp_manager,
+    )
+
+
 def add_tool_result(
     conversation_history: list[dict[str, Any]],
     tool_use_id: str,
@@ -492,20 +566,18 @@ def add_tool_result(
         result: Optional result data
         tool_name: Name of the tool that was executed
     """
-    content = message
+    # Add error prefix if failed (OpenAI doesn't have is_error flag)
+    parts = [message] if success else ["ERROR: ", message]
     if result:
         # Format MCP results properly to extract actual content
-        formatted_result = format_mcp_result(result)
-        content += f"\n\n{formatted_result}"
-
-    # Add error prefix if failed (OpenAI doesn't have is_error flag)
-    if not success:
-        content = f"ERROR: {content}"
+        parts += ["\n\n", format_mcp_result(result)]
+    # Joined once so large results aren't copied into intermediate strings
+    content = "".join(parts)
 
     # Check token count and limit if needed
     max_tokens = get_max_tool_result_tokens()
-    if tool_name and count_tokens(content) > max_tokens:
-        original_tokens = count_tokens(content)
+    original_tokens = count_tokens(content) if tool_name else 0
+    if tool_name and original_tokens > max_tokens:
         content = smart_truncate_tool_result(content, max_tokens, tool_name)
         final_tokens = count_tokens(content)
 
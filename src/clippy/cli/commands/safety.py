@@ -158,7 +158,8 @@ def _show_safety_status(agent: ClippyAgent, console: Console) -> None:
                         f"entries\n"
                         f"  Hit Rate: [cyan]{stats['hit_rate']:.1%}[/cyan]\n"
                         f"  Hits: [cyan]{stats['hits']}[/cyan], "
-                        f"Misses: [cyan]{stats['misses']}[/cyan]"
+                        f"Misses: [cyan]{stats['misses']}[/cyan], "
+                        f"In-flight waits: [cyan]{stats['inflight_waits']}[/cyan]"
                     )
                 else:
                     cache_info = "\n[bold]Cache Status:[/bold] [red]Disabled[/red]"
@@ -186,8 +186,14 @@ def handle_status_command(agent: ClippyAgent, console: Console) -> CommandResult
             f"  Messages: [cyan]{status['message_count']}[/cyan]\n\n"
             f"[bold]Conversation Context:[/bold]\n"
             f"  Context: [cyan]{status['total_tokens']:,}[/cyan] tokens\n"
-            f"  Usage: [{usage_bar}] [cyan]{usage_pct}[/cyan]\n\n"
+            f"  Usage: [{usage_bar}] [cyan]{usage_pct}[/cyan]\n"
         )
+        if "provider_prompt_tokens" in status:
+            status_content += (
+                f"  Last request: [cyan]{status['provider_prompt_tokens']:,}[/cyan] prompt tokens "
+                f"([cyan]{status['cached_tokens']:,}[/cyan] cached)\n"
+            )
+        status_content += "\n"
 
         # Add actual API usage if we have any
         if actual_tokens > 0:
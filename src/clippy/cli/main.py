@@ -10,7 +10,6 @@ from ..agent import ClippyAgent
 from ..agent.mcp_manager import set_mcp_manager
 from ..executor import ActionExecutor
 from ..mcp.config import load_config
-from ..mcp.manager import Manager
 from ..models import ProviderConfig, get_default_model_config, get_model_config
 from ..permissions import PermissionConfig, PermissionManager
 from .oneshot import run_one_shot
@@ -179,6 +178,9 @@ def main() -> None:
     mcp_manager = None
     console = Console()
     if mcp_config:
+        # Imported here so startup without MCP servers skips loading the MCP SDK
+        from ..mcp.manager import Manager
+
         try:
             mcp_manager = Manager(config=mcp_config, console=console)
             mcp_manager.start()  # Now synchronous - runs in background thread
@@ -364,7 +364,8 @@ class ActionExecutor:
                 Set to include temp directories for testing.
             llm_provider: LLM provider for command safety checking. If None, safety
                 checking is disabled and only basic pattern matching is used.
-            model: Model identifier to use for safety checks
+            model: Model identifier to use for safety checks. Overridden by
+                CLIPPY_SAFETY_MODEL when set.
         """
         self.permission_manager = permission_manager
         self._mcp_manager = None
@@ -374,6 +375,7 @@ class ActionExecutor:
 
         # Create safety checker with cache settings
         settings = get_settings()
+        model = settings.safety_model or model
         if llm_provider and settings.safety_checker_enabled and model:
             if settings.safety_cache_enabled:
                 self._safety_checker = create_safety_checker(
@@ -410,13 +412,15 @@ class ActionExecutor:
 
         Args:
             llm_provider: LLM provider instance for command safety checking
-            model: Model identifier to use for safety checks
+            model: Model identifier to use for safety checks. Overridden by
+                CLIPPY_SAFETY_MODEL when set.
         """
         # Store provider for later use
         self._llm_provider = llm_provider
 
         # Use cache settings
         settings = get_settings()
+        model = settings.safety_model or model
         if llm_provider and settings.safety_checker_enabled and model:
             if settings.safety_cache_enabled:
                 self._safety_checker = create_safety_checker(
@@ -4,16 +4,27 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Iterator
 from typing import Any
 
 import httpx
 
 from .base import BaseProvider
-from .errors import APIConnectionError, APITimeoutError, raise_for_status
-from .http_client import create_client, post_with_retry
+from .errors import (
+    APIConnectionError,
+    APITimeoutError,
+    AuthenticationError,
+    LLMError,
+    PermissionDeniedError,
+    raise_for_status,
+)
+from .http_client import create_client, post_with_retry, stream_with_retry
 
 logger = logging.getLogger(__name__)
 
+# Prompt-cache breakpoint; everything up to a marked block is cached for reuse
+EPHEMERAL_CACHE_CONTROL = {"type": "ephemeral"}
+
 
 class AnthropicProvider(BaseProvider):
     """Provider for Anthropic Claude API."""
@@ -38,6 +49,8 @@ class AnthropicProvider(BaseProvider):
         self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
         self._extra_headers = extra_headers or {}
         self._client = create_client()
+        # Last (source tools, converted tools) pair; the tool list rarely changes between turns
+        self._tools_cache: tuple[list[dict[str, Any]], list[dict[str, Any]]] | None = None
 
     def close(self) -> None:
         """Close the HTTP client."""
@@ -80,6 +93,35 @@ class AnthropicProvider(BaseProvider):
         except httpx.ReadTimeout as e:
             raise APITimeoutError(f"Request timed out: {e}") from e
 
+    def stream_message(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str = "claude-sonnet-4-20250514",
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream message using Anthropic Messages API.
+
+        Args:
+            messages: List of messages in OpenAI format
+            tools: Optional list of tool definitions in OpenAI format
+            model: Model identifier
+            **kwargs: Additional arguments (max_tokens, temperature, etc.)
+
+        Yields:
+            Streaming response chunks in OpenAI format
+        """
+        try:
+            yield from self._stream_message_internal(messages, tools, model, **kwargs)
+        except httpx.ConnectError as e:
+            raise APIConnectionError(f"Failed to connect to {self.base_url}: {e}") from e
+        except httpx.ReadTimeout as e:
+            raise APITimeoutError(f"Request timed out: {e}") from e
+        except httpx.HTTPStatusError as e:
+            # Map to the same typed errors create_message raises via raise_for_status
+            raise_for_status(e.response)
+            raise
+
     def _create_message_internal(
         self,
         messages: list[dict[str, Any]],
@@ -89,7 +131,97 @@ class AnthropicProvider(BaseProvider):
     ) -> dict[str, Any]:
         """Internal implementation of create_message."""
         url = f"{self.base_url}/v1/messages"
+        payload = self._build_payload(messages, tools, model, **kwargs)
+
+        logger.debug(f"Anthropic request to {url} with model {model}")
+
+        response = post_with_retry(
+            self._client,
+            url,
+            json=payload,
+            headers=self._headers(),
+        )
+        raise_for_status(response)
+
+        data = response.json()
+        return self._normalize_response(data)
+
+    def _stream_message_internal(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str,
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Internal implementation of stream_message.
+
+        Text deltas are yielded as they arrive. Content blocks are reassembled from
+        the event stream and normalized like a non-streaming response for the
+        final chunk.
+        """
+        url = f"{self.base_url}/v1/messages"
+        payload = self._build_payload(messages, tools, model, **kwargs)
+        payload["stream"] = True
+
+        logger.debug(f"Streaming Anthropic request to {url} with model {model}")
+
+        blocks: dict[int, dict[str, Any]] = {}
+        tool_input_parts: dict[int, list[str]] = {}
+        usage: dict[str, Any] = {}
+        stop_reason: str | None = None
+
+        for event in stream_with_retry(self._client, url, payload, self._headers()):
+            event_type = event.get("type")
+
+            if event_type == "message_start":
+                usage.update(event.get("message", {}).get("usage") or {})
+            elif event_type == "content_block_start":
+                index = event.get("index", len(blocks))
+                blocks[index] = dict(event.get("content_block", {}))
+                if blocks[index].get("type") == "tool_use":
+                    tool_input_parts[index] = []
+            elif event_type == "content_block_delta":
+                index = event.get("index", 0)
+                delta = event.get("delta", {})
+                if delta.get("type") == "text_delta":
+                    text = delta.get("text", "")
+                    block = blocks.setdefault(index, {"type": "text", "text": ""})
+                    block["text"] = block.get("text", "") + text
+                    yield {"role": "assistant", "content": text, "delta": True}
+                elif delta.get("type") == "input_json_delta":
+                    tool_input_parts.setdefault(index, []).append(delta.get("partial_json", ""))
+            elif event_type == "message_delta":
+                stop_reason = event.get("delta", {}).get("stop_reason") or stop_reason
+                usage.update(event.get("usage") or {})
+            elif event_type == "error":
+                error = event.get("error", {})
+                raise LLMError(f"Anthropic stream error: {error.get('message', error)}")
+
+        for index, parts in tool_input_parts.items():
+            raw_input = "".join(parts)
+            try:
+                blocks[index]["input"] = json.loads(raw_input) if raw_input else {}
+            except json.JSONDecodeError:
+                blocks[index]["input"] = {}
+
+        final = self._normalize_response(
+            {
+                "content": [blocks[index] for index in sorted(blocks)],
+                "stop_reason": stop_reason,
+                "usage": usage,
+            }
+        )
+        final["delta"] = False
+        yield final
 
+    def _build_payload(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Build the Messages API payload from OpenAI-format messages and tools."""
         # Extract system message and convert others
         system_content = None
         filtered_messages = []
@@ -112,28 +244,55 @@ class AnthropicProvider(BaseProvider):
         }
 
         if system_content:
-            payload["system"] = system_content
+            # The system prompt is identical across turns, so mark it as a cacheable prefix
+            payload["system"] = [
+                {"type": "text", "text": system_content, "cache_control": EPHEMERAL_CACHE_CONTROL}
+            ]
 
         if tools:
-            payload["tools"] = self._convert_tools(tools)
+            payload["tools"] = self._get_converted_tools(tools)
+
+        self._add_cache_breakpoints(payload)
 
         # Add optional parameters
         for key in ("temperature", "top_p", "top_k", "stop_sequences"):
             if key in kwargs:
                 payload[key] = kwargs[key]
 
-        logger.debug(f"Anthropic request to {url} with model {model}")
+        return payload
 
-        response = post_with_retry(
-            self._client,
-            url,
-            json=payload,
-            headers=self._headers(),
-        )
-        raise_for_status(response)
+    def _add_cache_breakpoints(self, payload: dict[str, Any]) -> None:
+        """Mark the stable tool list and the conversation so far as cacheable.
 
-        data = response.json()
-        return self._normalize_response(data)
+        Together with the system prompt this uses three of Anthropic's four cache
+        breakpoints. Marking the last message lets the next turn read the whole
+        previous conversation from the cache.
+
+        Args:
+            payload: Request payload (modified in place)
+        """
+        if payload.get("tools"):
+            # Copy the last tool, converted tools are reused across requests
+            payload["tools"][-1] = {
+                **payload["tools"][-1],
+                "cache_control": EPHEMERAL_CACHE_CONTROL,
+            }
+
+        if not payload["messages"]:
+            return
+        last_message = payload["messages"][-1]
+        content = last_message.get("content")
+        if isinstance(content, str):
+            if content:
+                last_message["content"] = [
+                    {"type": "text", "text": content, "cache_control": EPHEMERAL_CACHE_CONTROL}
+                ]
+        elif content:
+            # Copy the block, content lists may be shared with the caller's history
+            last_message["content"] = [
+                *content[:-1],
+                {**content[-1], "cache_control": EPHEMERAL_CACHE_CONTROL},
+            ]
 
     def _convert_message(self, msg: dict[str, Any]) -> dict[str, Any] | None:
         """Convert OpenAI message format to Anthropic format.
@@ -230,6 +389,30 @@ class AnthropicProvider(BaseProvider):
 
         return merged
 
+    def _get_converted_tools(self, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Convert tools to Anthropic format, reusing the previous conversion when possible.
+
+        The agent loop passes the same built-in tool definitions on every iteration, so
+        the conversion is only redone when the tool objects themselves change.
+
+        Args:
+            tools: Tools in OpenAI format
+
+        Returns:
+            A new list of tools in Anthropic format
+        """
+        cached = self._tools_cache
+        if (
+            cached is not None
+            and len(cached[0]) == len(tools)
+            and all(old is new for old, new in zip(cached[0], tools))
+        ):
+            converted = cached[1]
+        else:
+            converted = self._convert_tools(tools)
+            self._tools_cache = (list(tools), converted)
+        return list(converted)
+
     def _convert_tools(self, tools: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """Convert OpenAI tool format to Anthropic format.
 
@@ -293,10 +476,18 @@ class AnthropicProvider(BaseProvider):
         # Include usage if available
         usage = data.get("usage")
         if usage:
+            # input_tokens excludes prompt-cache reads and writes; fold them back in
+            cache_read = usage.get("cache_read_input_tokens") or 0
+            prompt_tokens = (
+                usage.get("input_tokens", 0)
+                + cache_read
+                + (usage.get("cache_creation_input_tokens") or 0)
+            )
             result["usage"] = {
-                "prompt_tokens": usage.get("input_tokens", 0),
+                "prompt_tokens": prompt_tokens,
                 "completion_tokens": usage.get("output_tokens", 0),
-                "total_tokens": usage.get("input_tokens", 0) + usage.get("output_tokens", 0),
+                "total_tokens": prompt_tokens + usage.get("output_tokens", 0),
+                "prompt_tokens_details": {"cached_tokens": cache_read},
             }
 
         return result
@@ -362,6 +553,41 @@ class ClaudeCodeOAuthProvider(AnthropicProvider):
                 return self._handle_auth_error_and_retry(messages, tools, model, **kwargs)
             raise
 
+    def stream_message(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str = "claude-sonnet-4-20250514",
+        **kwargs: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream message with automatic re-authentication on token expiry.
+
+        Re-authentication only happens before the first chunk is yielded; retrying
+        after that would repeat output the caller has already received.
+        """
+        yielded = False
+        try:
+            for chunk in super().stream_message(messages, tools, model, **kwargs):
+                yielded = True
+                yield chunk
+        except Exception as exc:
+            if not yielded and self._is_stream_auth_error(exc) and not self._reauth_in_progress:
+                response = self._handle_auth_error_and_retry(messages, tools, model, **kwargs)
+                yield {**response, "delta": False}
+                return
+            raise
+
+    def _is_stream_auth_error(self, exc: Exception) -> bool:
+        """Check if a streaming failure is an authentication error.
+
+        Typed API errors are trusted as is, so e.g. a BadRequestError mentioning
+        max_tokens is not mistaken for an expired token. Untyped errors fall back
+        to the message-based check in _is_auth_error.
+        """
+        if isinstance(exc, (AuthenticationError, PermissionDeniedError)):
+            return True
+        return not isinstance(exc, LLMError) and self._is_auth_error(exc)
+
     def _is_auth_error(self, exc: Exception) -> bool:
         """Check if an exception is an authentication error."""
         exc_str = str(exc).lower()
@@ -65,6 +65,9 @@ class BaseProvider:
     ) -> Iterator[dict[str, Any]]:
         """Stream a chat completion.
 
+        Providers must override at least one of create_message and stream_message,
+        since each default is implemented in terms of the other.
+
         Args:
             messages: List of messages in OpenAI format
             tools: Optional list of tool definitions in OpenAI format
@@ -74,7 +77,9 @@ class BaseProvider:
         Yields:
             Streaming response chunks in OpenAI format
         """
-        raise NotImplementedError
+        # Default implementation: yield the complete response as a single final chunk
+        response = self.create_message(messages, tools, model, **kwargs)
+        yield {**response, "delta": False}
 
     def close(self) -> None:
         """Close any open connections."""
@@ -25,6 +25,15 @@ DEFAULT_TIMEOUT = httpx.Timeout(
     pool=10.0,
 )
 
+# Keep idle connections around between agent turns. httpx drops them after 5s by
+# default, which forces a new TLS handshake whenever a tool run or an approval
+# prompt takes longer than that.
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
 # Status codes that should trigger a retry
 RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
@@ -105,6 +114,9 @@ def stream_with_retry(
                 logger.warning(f"Retryable error {response.status_code} from {url}")
                 raise RetryableHTTPError(response.status_code, "Retryable status code")
 
+            if response.is_error:
+                # Read the error body while the stream is open so callers can report it
+                response.read()
             response.raise_for_status()
 
             # Parse SSE (Server-Sent Events) stream
@@ -139,5 +151,6 @@ def create_client(timeout: httpx.Timeout | None = None) -> httpx.Client:
     """
     return httpx.Client(
         timeout=timeout or DEFAULT_TIMEOUT,
+        limits=DEFAULT_LIMITS,
         follow_redirects=True,
     )
@@ -39,6 +39,8 @@ class OpenAIProvider(BaseProvider):
         self.api_key = api_key
         self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
         self._client = create_client()
+        # Cleared when a backend rejects stream_options, so later streams omit it
+        self._stream_usage_supported = True
 
     def close(self) -> None:
         """Close the HTTP client."""
@@ -432,6 +434,9 @@ class OpenAIProvider(BaseProvider):
             "messages": self._prepare_messages_for_chat(messages, model),
             "stream": True,  # Enable streaming
         }
+        if self._stream_usage_supported:
+            # Ask for token usage; it arrives in a trailing chunk with empty choices
+            payload["stream_options"] = {"include_usage": True}
 
         if tools:
             payload["tools"] = tools
@@ -447,9 +452,14 @@ class OpenAIProvider(BaseProvider):
         accumulated_content = ""
         accumulated_tool_calls: list[dict[str, Any]] = []
         current_tool_call: dict[str, Any] | None = None
+        # Held back after finish_reason until the trailing usage chunk has been read
+        final_chunk: dict[str, Any] | None = None
 
         try:
-            for chunk in stream_with_retry(self._client, url, payload, self._headers()):
+            for chunk in self._open_chat_stream(url, payload):
+                if chunk.get("usage") and final_chunk is not None:
+                    final_chunk["usage"] = chunk["usage"]
+
                 # Parse OpenAI streaming format
                 choices = chunk.get("choices", [])
                 if not choices:
@@ -501,27 +511,59 @@ class OpenAIProvider(BaseProvider):
                 # Handle finish
                 if finish_reason:
                     tool_calls_result = accumulated_tool_calls if accumulated_tool_calls else None
+                    final_chunk = {
+                        "role": "assistant",
+                        "tool_calls": tool_calls_result,
+                        "finish_reason": finish_reason,
+                        "delta": False,
+                    }
                     if accumulated_content:
-                        yield {
-                            "role": "assistant",
-                            "content": accumulated_content,
-                            "tool_calls": tool_calls_result,
-                            "finish_reason": finish_reason,
-                            "delta": False,
-                        }
-                    else:
-                        yield {
-                            "role": "assistant",
-                            "tool_calls": tool_calls_result,
-                            "finish_reason": finish_reason,
-                            "delta": False,
-                        }
-                    return
+                        final_chunk["content"] = accumulated_content
+                    # Some OpenAI-compatible servers report usage on the finish chunk
+                    if chunk.get("usage"):
+                        final_chunk["usage"] = chunk["usage"]
+
+            if final_chunk is not None:
+                yield final_chunk
 
         except Exception as e:
             logger.error(f"Error during streaming: {e}")
             raise
 
+    def _open_chat_stream(self, url: str, payload: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Open a Chat Completions stream, retrying once without stream_options.
+
+        Not every OpenAI-compatible backend accepts stream_options. The HTTP status is
+        checked before any chunk is read, so a 400 or 422 rejection can be retried
+        without it, and later streams from this provider leave it out.
+
+        Args:
+            url: Chat Completions endpoint
+            payload: Streaming request payload
+
+        Yields:
+            Parsed SSE data chunks
+        """
+        chunks = stream_with_retry(self._client, url, payload, self._headers())
+        try:
+            first = next(chunks, None)
+        except httpx.HTTPStatusError as e:
+            if "stream_options" not in payload or e.response.status_code not in (400, 422):
+                raise
+            logger.warning(
+                f"{url} rejected stream_options ({e.response.status_code}); "
+                "retrying without usage reporting"
+            )
+            self._stream_usage_supported = False
+            payload = {key: value for key, value in payload.items() if key != "stream_options"}
+            chunks = stream_with_retry(self._client, url, payload, self._headers())
+            first = next(chunks, None)
+
+        if first is None:
+            return
+        yield first
+        yield from chunks
+
     def _normalize_responses_response(self, data: dict[str, Any]) -> dict[str, Any]:
         """Normalize Responses API response to standard format.
 
@@ -1,6 +1,19 @@
 """MCP (Model Context Protocol) integration for clippy-code."""
 
+from typing import TYPE_CHECKING, Any
+
 from .config import Config, load_config
-from .manager import Manager
+
+if TYPE_CHECKING:
+    from .manager import Manager
 
 __all__ = ["Manager", "Config", "load_config"]
+
+
+def __getattr__(name: str) -> Any:
+    """Import Manager on first access; the MCP SDK it needs is slow to import."""
+    if name == "Manager":
+        from .manager import Manager
+
+        return Manager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
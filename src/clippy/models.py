@@ -844,6 +844,33 @@ def get_model_compaction_threshold(
     return None
 
 
+def get_model_context_window(name_or_id: str) -> int | None:
+    """Get the configured context window for a specific model.
+
+    Looks up by saved model name first (case-insensitive), then by model_id.
+    If multiple models share the model_id, the smallest context window is returned.
+
+    Args:
+        name_or_id: Saved model name or underlying provider model_id
+
+    Returns:
+        Context window in tokens, or None if not set
+    """
+    user_manager = get_user_manager()
+
+    model = user_manager.get_model(name_or_id)
+    if model:
+        return model.context_window
+
+    lookup = name_or_id.lower()
+    windows = [
+        m.context_window
+        for m in user_manager.list_models()
+        if m.model_id.lower() == lookup and m.context_window is not None
+    ]
+    return min(windows) if windows else None
+
+
 def set_model_compaction_threshold(name: str, threshold: int | None) -> tuple[bool, str]:
     """Set the compaction threshold for a specific model.
 
@@ -15,6 +15,7 @@ class ClippySettings:
         self._safety_cache_enabled = self._get_bool_env("CLIPPY_SAFETY_CACHE_ENABLED", True)
         self._safety_cache_size = self._get_int_env("CLIPPY_SAFETY_CACHE_SIZE", 1000)
         self._safety_cache_ttl = self._get_int_env("CLIPPY_SAFETY_CACHE_TTL", 3600)
+        self._safety_model = os.getenv("CLIPPY_SAFETY_MODEL") or None
 
     def _get_bool_env(self, key: str, default: bool) -> bool:
         """Get a boolean environment variable.
@@ -114,6 +115,17 @@ class ClippySettings:
         """
         return self._safety_cache_ttl
 
+    @property
+    def safety_model(self) -> str | None:
+        """Model to use for command safety checks instead of the main model.
+
+        A small, fast model is usually enough to classify shell commands.
+
+        Returns:
+            Model identifier, or None to use the main model
+        """
+        return self._safety_model
+
     def reload(self) -> None:
         """Reload settings from environment variables.
 
@@ -126,6 +138,7 @@ class ClippySettings:
         self._safety_cache_enabled = self._get_bool_env("CLIPPY_SAFETY_CACHE_ENABLED", True)
         self._safety_cache_size = self._get_int_env("CLIPPY_SAFETY_CACHE_SIZE", 1000)
         self._safety_cache_ttl = self._get_int_env("CLIPPY_SAFETY_CACHE_TTL", 3600)
+        self._safety_model = os.getenv("CLIPPY_SAFETY_MODEL") or None
 
 
 # Global settings instance
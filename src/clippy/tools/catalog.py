@@ -1,11 +1,15 @@
 """Tool catalog for merging built-in and MCP tools with enhanced categorization."""
 
+from __future__ import annotations
+
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from ..mcp.manager import Manager
 from ..tools import TOOLS as BUILTIN_TOOLS
 
+if TYPE_CHECKING:
+    from ..mcp.manager import Manager
+
 logger = logging.getLogger(__name__)
 
 
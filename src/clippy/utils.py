@@ -1,5 +1,6 @@
 """Utility functions for clippy-code."""
 
+import functools
 import logging
 import os
 
@@ -8,6 +9,23 @@ import tiktoken
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def get_encoding_for_model(model: str) -> tiktoken.Encoding:
+    """
+    Get the tiktoken encoding for a model, cached so it is resolved once per model.
+
+    Args:
+        model: Model name to get the encoding for
+
+    Returns:
+        Encoding for the model, or cl100k_base for models tiktoken doesn't know
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
 def count_tokens(text: str, model: str = "gpt-4") -> int:
     """
     Count tokens in a text string using tiktoken.
@@ -20,12 +38,7 @@ def count_tokens(text: str, model: str = "gpt-4") -> int:
         Number of tokens in the text
     """
     try:
-        # Try to get the appropriate encoding for the model
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # Fall back to cl100k_base for unknown models
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding_for_model(model)
 
         return len(encoding.encode(text))
     except Exception as e:
@@ -72,12 +85,7 @@ def truncate_text_to_tokens(
         return "[Content truncated: max_tokens too small for warning]"
 
     try:
-        # Try to get the appropriate encoding for the model
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # Fall back to cl100k_base for unknown models
-            encoding = tiktoken.get_encoding("cl100k_base")
+        encoding = get_encoding_for_model(model)
 
         # Convert text to tokens
         tokens = encoding.encode(text)
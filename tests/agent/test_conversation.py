@@ -10,6 +10,7 @@ from clippy.agent.conversation import (
     check_and_auto_compact,
     compact_conversation,
     create_system_prompt,
+    estimate_token_count,
     get_token_count,
 )
 from clippy.providers import LLMProvider
@@ -35,6 +36,16 @@ def mock_provider() -> MagicMock:
     return provider
 
 
+@pytest.fixture
+def fake_encoding() -> MagicMock:
+    """Create a whitespace-splitting stand-in for a tiktoken encoding."""
+    encoding = MagicMock()
+    encoding.name = "fake"
+    encoding.encode_ordinary.side_effect = lambda text: text.split()
+    encoding.encode_ordinary_batch.side_effect = lambda texts: [text.split() for text in texts]
+    return encoding
+
+
 @pytest.fixture
 def sample_conversation() -> list[dict[str, Any]]:
     """Create a sample conversation history."""
@@ -174,6 +185,27 @@ class TestCreateSystemPrompt:
         finally:
             os.chdir(original_dir)
 
+    def test_reuses_cached_prompt_until_docs_change(self, tmp_path: Path) -> None:
+        """Test that the docs file is only re-read when it changes."""
+        import os
+
+        agents_file = tmp_path / "AGENTS.md"
+        agents_file.write_text("original docs", encoding="utf-8")
+
+        original_dir = os.getcwd()
+        try:
+            os.chdir(tmp_path)
+            first = create_system_prompt()
+            with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+                second = create_system_prompt()
+            assert second is first
+
+            agents_file.write_text("updated docs, longer", encoding="utf-8")
+            third = create_system_prompt()
+            assert "updated docs, longer" in third
+        finally:
+            os.chdir(original_dir)
+
 
 class TestGetTokenCount:
     """Tests for get_token_count function."""
@@ -309,6 +341,100 @@ class TestGetTokenCount:
         assert result["tool_tokens"] > 0
 
 
+class TestTokenCountCache:
+    """Tests for per-message token count caching."""
+
+    def test_unchanged_messages_are_not_reencoded(self, fake_encoding: MagicMock) -> None:
+        """Test that repeated counts only encode each message once."""
+        conversation = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Hello there!"},
+        ]
+
+        with patch("clippy.agent.conversation._get_encoding", return_value=fake_encoding):
+            first = get_token_count(conversation, model="gpt-4", base_url=None)
+            calls_after_first = fake_encoding.encode_ordinary.call_count
+            second = get_token_count(conversation, model="gpt-4", base_url=None)
+
+        assert first["total_tokens"] == second["total_tokens"]
+        assert fake_encoding.encode_ordinary.call_count == calls_after_first
+
+    def test_only_new_messages_are_encoded(self, fake_encoding: MagicMock) -> None:
+        """Test that appending a message only encodes the new message."""
+        conversation = [{"role": "user", "content": "first message"}]
+
+        with patch("clippy.agent.conversation._get_encoding", return_value=fake_encoding):
+            get_token_count(conversation, model="gpt-4", base_url=None)
+            conversation.append({"role": "assistant", "content": "second message"})
+            fake_encoding.encode_ordinary.reset_mock()
+            get_token_count(conversation, model="gpt-4", base_url=None)
+
+        encoded = [call.args[0] for call in fake_encoding.encode_ordinary.call_args_list]
+        assert encoded == ["assistant\nsecond message"]
+
+    def test_many_uncached_messages_use_batch_encoding(self, fake_encoding: MagicMock) -> None:
+        """Test that bulk misses are tokenized with a single batch call."""
+        conversation = [{"role": "user", "content": f"message number {i}"} for i in range(10)]
+
+        with patch("clippy.agent.conversation._get_encoding", return_value=fake_encoding):
+            result = get_token_count(conversation, model="gpt-4", base_url=None)
+
+        fake_encoding.encode_ordinary_batch.assert_called_once()
+        fake_encoding.encode_ordinary.assert_not_called()
+        # 1 role token + 3 content tokens + 4 overhead per message
+        assert result["total_tokens"] == 10 * (1 + 3 + 4)
+
+    def test_edited_message_is_recounted(self, fake_encoding: MagicMock) -> None:
+        """Test that in-place edits invalidate the cached count."""
+        conversation = [{"role": "user", "content": "one two"}]
+
+        with patch("clippy.agent.conversation._get_encoding", return_value=fake_encoding):
+            before = get_token_count(conversation, model="gpt-4", base_url=None)
+            conversation[0]["content"] = "one two three four"
+            after = get_token_count(conversation, model="gpt-4", base_url=None)
+
+        assert after["total_tokens"] == before["total_tokens"] + 2
+
+    def test_edited_tool_call_arguments_are_recounted(self, fake_encoding: MagicMock) -> None:
+        """Test that editing tool call arguments in place invalidates the cached count."""
+        tool_calls = [{"id": "call_1", "function": {"name": "run", "arguments": "a"}}]
+        conversation = [{"role": "assistant", "content": None, "tool_calls": tool_calls}]
+
+        with patch("clippy.agent.conversation._get_encoding", return_value=fake_encoding):
+            before = get_token_count(conversation, model="gpt-4", base_url=None)
+            tool_calls[0]["function"]["arguments"] = "a b c"
+            after = get_token_count(conversation, model="gpt-4", base_url=None)
+
+        assert after["total_tokens"] == before["total_tokens"] + 2
+
+
+class TestEstimateTokenCount:
+    """Tests for estimate_token_count function."""
+
+    def test_empty_conversation(self) -> None:
+        """Test that an empty conversation estimates to zero."""
+        assert estimate_token_count([]) == 0
+
+    def test_uses_chars_per_token_heuristic(self) -> None:
+        """Test that content is estimated at ~4 characters per token plus overhead."""
+        conversation = [{"role": "user", "content": "x" * 400}]
+
+        assert estimate_token_count(conversation) == 100 + 4
+
+    def test_includes_tool_calls(self) -> None:
+        """Test that tool calls contribute to the estimate."""
+        plain = [{"role": "assistant", "content": ""}]
+        with_tools = [
+            {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{"function": {"name": "read_file", "arguments": "{}"}}],
+            }
+        ]
+
+        assert estimate_token_count(with_tools) > estimate_token_count(plain)
+
+
 class TestCompactConversation:
     """Tests for compact_conversation function."""
 
@@ -344,6 +470,33 @@ class TestCompactConversation:
         # Should have: system + summary + 2 recent messages = 4
         assert len(new_history) == 4
 
+    def test_reuses_caller_before_stats(
+        self,
+        mock_provider: MagicMock,
+        sample_conversation: list[dict[str, Any]],
+        fake_encoding: MagicMock,
+    ) -> None:
+        """Test that precomputed before_stats skip recounting the full history."""
+        mock_provider.stream_message.return_value = iter([{"content": "Summary of work."}])
+
+        with patch("clippy.agent.conversation._get_encoding", return_value=fake_encoding):
+            before_stats = get_token_count(sample_conversation, model="gpt-4", base_url=None)
+            with patch(
+                "clippy.agent.conversation.get_token_count", wraps=get_token_count
+            ) as counter:
+                success, _, stats, new_history = compact_conversation(
+                    sample_conversation,
+                    mock_provider,
+                    "gpt-4",
+                    keep_recent=2,
+                    before_stats=before_stats,
+                )
+
+        assert success is True
+        assert stats["before_tokens"] == before_stats["total_tokens"]
+        # Only the compacted history is counted
+        counter.assert_called_once_with(new_history, "gpt-4", None)
+
     def test_preserves_system_message(
         self, mock_provider: MagicMock, sample_conversation: list[dict[str, Any]]
     ) -> None:
@@ -550,6 +703,56 @@ class TestCheckAndAutoCompact:
         assert "below threshold" in message.lower()
         assert new_history is None
 
+    @patch("clippy.agent.conversation.get_token_count")
+    @patch("clippy.agent.conversation.get_model_compaction_threshold")
+    def test_upper_bound_below_threshold_skips_exact_count(
+        self,
+        mock_get_model_threshold: MagicMock,
+        mock_get_token_count: MagicMock,
+        mock_provider: MagicMock,
+    ) -> None:
+        """Test that exact tokenization is skipped when the byte upper bound is below."""
+        conversation = [
+            {"role": "system", "content": "system prompt"},
+            {"role": "user", "content": "hello"},
+        ]
+        mock_get_model_threshold.return_value = 100_000
+
+        compacted, message, stats, new_history = check_and_auto_compact(
+            conversation, "test-model", mock_provider
+        )
+
+        assert compacted is False
+        assert "below threshold" in message.lower()
+        mock_get_token_count.assert_not_called()
+
+    @patch("clippy.agent.conversation.compact_conversation")
+    @patch("clippy.agent.conversation.get_token_count")
+    @patch("clippy.agent.conversation.get_model_compaction_threshold")
+    def test_dense_content_is_counted_exactly(
+        self,
+        mock_get_model_threshold: MagicMock,
+        mock_get_token_count: MagicMock,
+        mock_compact_conversation: MagicMock,
+        mock_provider: MagicMock,
+    ) -> None:
+        """Test that text denser than 4 chars per token is not skipped by the pre-screen."""
+        conversation = [
+            {"role": "system", "content": "system prompt"},
+            {"role": "user", "content": "漢字かな交じり文" * 150},
+        ]
+        # chars/4 estimates ~300 tokens here, while CJK runs close to a token per char
+        mock_get_model_threshold.return_value = 1000
+        mock_get_token_count.return_value = {"total_tokens": 1200, "message_count": 2}
+        mock_compact_conversation.return_value = (True, "compacted", {}, conversation[:1])
+
+        compacted, message, stats, new_history = check_and_auto_compact(
+            conversation, "test-model", mock_provider
+        )
+
+        assert compacted is True
+        mock_get_token_count.assert_called_once()
+
     @patch("clippy.agent.conversation.compact_conversation")
     @patch("clippy.agent.conversation.get_token_count")
     @patch("clippy.agent.conversation.get_model_compaction_threshold")
@@ -632,3 +835,41 @@ class TestCheckAndAutoCompact:
         assert compacted is False
         assert "too short" in message.lower()
         assert new_history is None
+
+    @patch("clippy.agent.conversation.compact_conversation")
+    @patch("clippy.agent.conversation.get_token_count")
+    @patch("clippy.agent.conversation.get_model_context_window")
+    @patch("clippy.agent.conversation.get_model_compaction_threshold")
+    def test_context_window_fallback_threshold(
+        self,
+        mock_get_model_threshold: MagicMock,
+        mock_get_context_window: MagicMock,
+        mock_get_token_count: MagicMock,
+        mock_compact_conversation: MagicMock,
+        mock_provider: MagicMock,
+    ) -> None:
+        """Test that 80% of the context window is used when no threshold is set."""
+        conversation = [
+            {"role": "system", "content": "system prompt"},
+            {"role": "user", "content": "x" * 4000},
+        ]
+
+        mock_get_model_threshold.return_value = None
+        mock_get_context_window.return_value = 1000
+        mock_get_token_count.return_value = {"total_tokens": 900, "message_count": 2}
+        mock_compact_conversation.return_value = (True, "compacted", {}, conversation[:1])
+
+        compacted, message, stats, new_history = check_and_auto_compact(
+            conversation, "test-model", mock_provider
+        )
+
+        assert compacted is True
+        mock_compact_conversation.assert_called_once()
+
+        mock_get_token_count.return_value = {"total_tokens": 700, "message_count": 2}
+        compacted, message, stats, new_history = check_and_auto_compact(
+            conversation, "test-model", mock_provider
+        )
+
+        assert compacted is False
+        assert "(800)" in message
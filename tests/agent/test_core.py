@@ -1,6 +1,9 @@
 """Tests for the agent model switching functionality."""
 
+from unittest.mock import patch
+
 import pytest
+from rich.console import Console
 
 from clippy.agent import ClippyAgent
 from clippy.executor import ActionExecutor
@@ -198,3 +201,60 @@ def test_approval_callback_respects_response() -> None:
 
     # Verify the callback is set
     assert agent.approval_callback is deny_callback
+
+
+def test_token_count_uses_provider_usage_baseline(mock_agent: ClippyAgent) -> None:
+    """Test that reported usage plus an estimate for new messages is surfaced."""
+    mock_agent.conversation_history = [
+        {"role": "system", "content": "system prompt"},
+        {"role": "user", "content": "hello"},
+    ]
+    mock_agent._record_usage(
+        {"prompt_tokens": 120, "prompt_tokens_details": {"cached_tokens": 100}}, 2
+    )
+    mock_agent.conversation_history.append({"role": "assistant", "content": "x" * 40})
+
+    with patch("clippy.agent.core.get_token_count", return_value={"total_tokens": 130}):
+        stats = mock_agent.get_token_count()
+
+    assert stats["total_tokens"] == 130
+    assert stats["provider_prompt_tokens"] == 120
+    assert stats["cached_tokens"] == 100
+    # 40 chars / 4 plus per-message overhead
+    assert stats["provider_context_tokens"] == 120 + 10 + 4
+
+
+def test_token_count_ignores_stale_provider_usage(mock_agent: ClippyAgent) -> None:
+    """Test that usage is dropped once the sent messages are no longer the prefix."""
+    mock_agent.conversation_history = [{"role": "user", "content": "hello"}]
+    mock_agent._record_usage({"prompt_tokens": 50}, 1)
+
+    # In-place rewrite, as done by auto-compaction inside the loop
+    mock_agent.conversation_history[:] = [{"role": "user", "content": "summary"}]
+
+    with patch("clippy.agent.core.get_token_count", return_value={"total_tokens": 5}):
+        stats = mock_agent.get_token_count()
+
+    assert "provider_prompt_tokens" not in stats
+
+    mock_agent._record_usage({"prompt_tokens": 50}, 1)
+    mock_agent.reset_conversation()
+    with patch("clippy.agent.core.get_token_count", return_value={"total_tokens": 0}):
+        assert "provider_prompt_tokens" not in mock_agent.get_token_count()
+
+
+def test_agents_share_default_console(mock_agent: ClippyAgent) -> None:
+    """Test that agents reuse one console unless a console is injected."""
+    permission_manager = PermissionManager(PermissionConfig())
+    executor = ActionExecutor(permission_manager)
+    other = ClippyAgent(permission_manager=permission_manager, executor=executor, model="gpt-5")
+    custom_console = Console()
+    injected = ClippyAgent(
+        permission_manager=permission_manager,
+        executor=executor,
+        model="gpt-5",
+        console=custom_console,
+    )
+
+    assert other.console is mock_agent.console
+    assert injected.console is custom_console
@@ -173,3 +173,14 @@ def test_format_api_error_known_branches(error_class, expected):
     message = format_api_error(error)
 
     assert expected in message
+
+
+def test_format_api_error_subclass_uses_closest_message():
+    """Subclasses of known errors get the message of their nearest known base."""
+
+    class ProviderRateLimitError(RateLimitError):
+        pass
+
+    message = format_api_error(ProviderRateLimitError("slow down"))
+
+    assert "Rate limit exceeded" in message
@@ -981,3 +981,115 @@ class TestRunAgentLoop:
         assert result == "I couldn't read the file."
         # Should have completed both iterations
         assert mock_provider.stream_message.call_count == 2
+
+
+class TestProcessStreamingResponse:
+    """Tests for _process_streaming_response."""
+
+    def test_keeps_tool_calls_from_final_chunk(self, console: Console) -> None:
+        """Test that tool calls and finish reason on the final chunk are returned."""
+        from clippy.agent.loop import _process_streaming_response
+
+        tool_calls = [{"id": "call_1", "function": {"name": "think", "arguments": "{}"}}]
+        provider = MagicMock()
+        provider.stream_message.return_value = iter(
+            [
+                {"role": "assistant", "content": "Let me think", "delta": True},
+                {
+                    "role": "assistant",
+                    "content": "Let me think",
+                    "tool_calls": tool_calls,
+                    "finish_reason": "tool_calls",
+                    "delta": False,
+                },
+            ]
+        )
+
+        response = _process_streaming_response(provider, [], [], "gpt-4", console)
+
+        assert response["content"] == "Let me think"
+        assert response["tool_calls"] == tool_calls
+        assert response["finish_reason"] == "tool_calls"
+
+    def test_returns_usage_from_final_chunk(self, console: Console) -> None:
+        """Test that provider-reported usage is passed through for token tracking."""
+        from clippy.agent.loop import _process_streaming_response
+
+        usage = {"prompt_tokens": 12, "completion_tokens": 3, "total_tokens": 15}
+        provider = MagicMock()
+        provider.stream_message.return_value = iter(
+            [
+                {"role": "assistant", "content": "Hi", "delta": True},
+                {
+                    "role": "assistant",
+                    "content": "Hi",
+                    "finish_reason": "stop",
+                    "usage": usage,
+                    "delta": False,
+                },
+            ]
+        )
+
+        response = _process_streaming_response(provider, [], [], "gpt-4", console)
+
+        assert response["usage"] == usage
+
+    def test_streamed_tool_calls_reach_the_executor(
+        self,
+        permission_manager: PermissionManager,
+        executor: ActionExecutor,
+        console: Console,
+        conversation_history: list[dict[str, Any]],
+        tmp_path: Any,
+    ) -> None:
+        """Test that tool calls assembled on the final stream chunk are executed.
+
+        Regression test: tool_calls on the final chunk used to be dropped, so a
+        streamed tool call never ran.
+        """
+        target = tmp_path / "notes.txt"
+        target.write_text("streamed tool call ran")
+        tool_calls = [
+            {
+                "id": "call_1",
+                "type": "function",
+                "function": {
+                    "name": "read_file",
+                    "arguments": json.dumps({"path": str(target)}),
+                },
+            }
+        ]
+        provider = MagicMock()
+        provider.stream_message.side_effect = [
+            iter(
+                [
+                    {"role": "assistant", "content": "Reading", "delta": True},
+                    {
+                        "role": "assistant",
+                        "content": "Reading",
+                        "tool_calls": tool_calls,
+                        "finish_reason": "tool_calls",
+                        "delta": False,
+                    },
+                ]
+            ),
+            iter([{"role": "assistant", "content": "Done", "finish_reason": "stop"}]),
+        ]
+
+        config = AgentLoopConfig(
+            provider=provider,
+            model="gpt-4",
+            permission_manager=permission_manager,
+            executor=executor,
+            console=console,
+            auto_approve_all=True,
+            approval_callback=None,
+            check_interrupted=lambda: False,
+        )
+        result = run_agent_loop(conversation_history=conversation_history, config=config)
+
+        assert result == "Done"
+        tool_messages = [m for m in conversation_history if m["role"] == "tool"]
+        assert len(tool_messages) == 1
+        assert tool_messages[0]["tool_call_id"] == "call_1"
+        assert "streamed tool call ran" in tool_messages[0]["content"]
@@ -651,3 +651,114 @@ class TestMultiToolSequences:
         assert conversation_history[3]["role"] == "tool"
         assert conversation_history[4]["role"] == "assistant"
         assert conversation_history[4]["content"] == "Done reading."
+
+
+def _tool_call(call_id: str, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+    """Build an OpenAI-format tool call."""
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)},
+    }
+
+
+class BarrierExecutor:
+    """Executor stub whose read calls only complete if they all run concurrently."""
+
+    def __init__(self, parties: int) -> None:
+        import threading
+
+        self.barrier = threading.Barrier(parties, timeout=5)
+        self.calls: list[str] = []
+
+    def execute(
+        self, tool_name: str, tool_input: dict[str, Any], bypass_trust_check: bool = False
+    ) -> tuple[bool, str, Any]:
+        self.calls.append(tool_name)
+        if tool_name != "write_file":
+            self.barrier.wait()
+        return True, f"{tool_name} ok", tool_input.get("path")
+
+
+class TestParallelReadOnlyTools:
+    """Tests for concurrent execution of read-only tool calls within one turn."""
+
+    def test_consecutive_reads_run_concurrently(
+        self,
+        mock_provider: MagicMock,
+        permission_manager: PermissionManager,
+        console: Console,
+        conversation_history: list[dict[str, Any]],
+    ) -> None:
+        """Test that auto-approved reads overlap and results stay in call order."""
+        executor = BarrierExecutor(parties=3)
+        tool_calls = [
+            _tool_call("call_1", "read_file", {"path": "a.txt"}),
+            _tool_call("call_2", "list_directory", {"path": "b"}),
+            _tool_call("call_3", "grep", {"pattern": "x", "path": "c"}),
+        ]
+        mock_provider.stream_message.side_effect = [
+            iter([{"role": "assistant", "tool_calls": tool_calls, "finish_reason": "tool_calls"}]),
+            iter([{"role": "assistant", "content": "Done.", "finish_reason": "stop"}]),
+        ]
+
+        config = AgentLoopConfig(
+            provider=mock_provider,
+            model="gpt-4",
+            permission_manager=permission_manager,
+            executor=executor,  # type: ignore[arg-type]
+            console=console,
+            check_interrupted=lambda: False,
+        )
+        result = run_agent_loop(conversation_history=conversation_history, config=config)
+
+        assert result == "Done."
+        tool_results = [msg for msg in conversation_history if msg.get("role") == "tool"]
+        assert [msg["tool_call_id"] for msg in tool_results] == ["call_1", "call_2", "call_3"]
+
+    def test_write_splits_parallel_runs(self, permission_manager: PermissionManager) -> None:
+        """Test that reads after a write are not grouped with reads before it."""
+        from clippy.agent.loop import _find_parallel_runs
+
+        tool_calls = [
+            _tool_call("call_1", "read_file", {"path": "a"}),
+            _tool_call("call_2", "read_file", {"path": "b"}),
+            _tool_call("call_3", "write_file", {"path": "c", "content": ""}),
+            _tool_call("call_4", "read_file", {"path": "c"}),
+            _tool_call("call_5", "get_file_info", {"path": "c"}),
+        ]
+        config = AgentLoopConfig(
+            provider=MagicMock(),
+            model="gpt-4",
+            permission_manager=permission_manager,
+            executor=MagicMock(),
+            console=MagicMock(),
+        )
+
+        runs = _find_parallel_runs(tool_calls, config)
+
+        assert sorted(runs) == [0, 3]
+        assert [entry[0] for entry in runs[0]] == [0, 1]
+        assert [entry[0] for entry in runs[3]] == [3, 4]
+
+    def test_reads_requiring_approval_stay_serial(
+        self, permission_manager: PermissionManager
+    ) -> None:
+        """Test that reads needing user approval are never prefetched."""
+        from clippy.agent.loop import _find_parallel_runs
+        from clippy.permissions import ActionType, PermissionLevel
+
+        permission_manager.update_permission(ActionType.READ_FILE, PermissionLevel.REQUIRE_APPROVAL)
+        tool_calls = [
+            _tool_call("call_1", "read_file", {"path": "a"}),
+            _tool_call("call_2", "read_file", {"path": "b"}),
+        ]
+        config = AgentLoopConfig(
+            provider=MagicMock(),
+            model="gpt-4",
+            permission_manager=permission_manager,
+            executor=MagicMock(),
+            console=MagicMock(),
+        )
+
+        assert _find_parallel_runs(tool_calls, config) == {}
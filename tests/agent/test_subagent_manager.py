@@ -1,5 +1,6 @@
 """Tests for the SubAgentManager class."""
 
+import threading
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -170,8 +171,7 @@ class TestSubAgentManager:
 
         # Create and move to completed
         manager.create_subagent(subagent_config)
-        del manager.active_subagents[subagent_config.name]
-        manager.completed_subagents.append(mock_subagent)
+        manager._mark_completed(mock_subagent, None)
 
         # Get status
         status = manager.get_subagent_status(subagent_config.name)
@@ -322,7 +322,7 @@ class TestSubAgentManager:
             )
             mock_subagent.result = result
             mock_subagent_class.return_value = mock_subagent
-            manager.completed_subagents.append(mock_subagent)
+            manager._mark_completed(mock_subagent, result)
             mock_subagents.append(mock_subagent)
 
         # Get statistics
@@ -343,14 +343,20 @@ class TestSubAgentManager:
         # Add some completed subagents
         for i in range(3):
             mock_subagent = MagicMock(spec=SubAgent)
-            manager.completed_subagents.append(mock_subagent)
+            mock_subagent.config = SubAgentConfig(
+                name=f"test_{i}", task=f"Task {i}", subagent_type="general"
+            )
+            manager._mark_completed(mock_subagent, None)
 
         assert len(manager.completed_subagents) == 3
+        assert manager.get_statistics()["completed_count"] == 3
 
         # Clear
         manager.clear_completed()
 
         assert len(manager.completed_subagents) == 0
+        assert manager.completed_by_name == {}
+        assert manager.get_statistics()["completed_count"] == 0
 
     def test_set_max_concurrent_valid(self, manager):
         """Test setting valid max concurrent."""
@@ -410,6 +416,10 @@ class TestSubAgentManager:
         # Verify completed tracking
         assert len(manager.completed_subagents) == 2
         assert len(manager.active_subagents) == 0
+        assert manager.completed_by_name == {
+            "test_0": mock_subagents[0],
+            "test_1": mock_subagents[1],
+        }
 
     @patch("clippy.agent.subagent_manager.SubAgent")
     def test_run_parallel(self, mock_subagent_class, manager, subagent_config):
@@ -462,6 +472,62 @@ class TestSubAgentManager:
         results = manager.run_parallel([])
         assert results == []
 
+    def test_run_parallel_iter_yields_in_completion_order(self, manager):
+        """Test that run_parallel_iter yields early finishers before slow subagents."""
+        release_slow = threading.Event()
+        slow_result = SubAgentResult(
+            success=True, output="slow", error=None, iterations_used=1, execution_time=1.0
+        )
+        fast_result = SubAgentResult(
+            success=True, output="fast", error=None, iterations_used=1, execution_time=1.0
+        )
+
+        slow = MagicMock(spec=SubAgent)
+        slow.config = SubAgentConfig(name="slow", task="Slow task", subagent_type="general")
+        slow.run.side_effect = lambda: release_slow.wait(5) and slow_result
+        fast = MagicMock(spec=SubAgent)
+        fast.config = SubAgentConfig(name="fast", task="Fast task", subagent_type="general")
+        fast.run.return_value = fast_result
+
+        results = manager.run_parallel_iter([slow, fast], max_concurrent=2)
+
+        assert next(results) == (1, fast_result)
+        release_slow.set()
+        assert next(results) == (0, slow_result)
+        assert list(results) == []
+        assert len(manager.completed_subagents) == 2
+
+    def test_run_parallel_iter_closed_early_marks_all_completed(self, manager):
+        """Test that subagents finishing after the caller stops iterating are still recorded."""
+        release_slow = threading.Event()
+        slow_result = SubAgentResult(
+            success=True, output="slow", error=None, iterations_used=2, execution_time=1.0
+        )
+        fast_result = SubAgentResult(
+            success=True, output="fast", error=None, iterations_used=1, execution_time=1.0
+        )
+
+        slow = MagicMock(spec=SubAgent)
+        slow.config = SubAgentConfig(name="slow", task="Slow task", subagent_type="general")
+        slow.run.side_effect = lambda: release_slow.wait(5) and slow_result
+        fast = MagicMock(spec=SubAgent)
+        fast.config = SubAgentConfig(name="fast", task="Fast task", subagent_type="general")
+        fast.run.return_value = fast_result
+        manager.active_subagents = {"slow": slow, "fast": fast}
+
+        results = manager.run_parallel_iter([slow, fast], max_concurrent=2)
+        assert next(results) == (1, fast_result)
+
+        release_slow.set()
+        results.close()
+
+        assert manager.active_subagents == {}
+        assert set(manager.completed_by_name) == {"slow", "fast"}
+        stats = manager.get_statistics()
+        assert stats["completed_count"] == 2
+        assert stats["successful_count"] == 2
+        assert stats["total_iterations"] == 3
+
     @patch("clippy.agent.subagent_manager.SubAgent")
     def test_run_parallel_with_exception(self, mock_subagent_class, manager, subagent_config):
         """Test running subagents in parallel with exception."""
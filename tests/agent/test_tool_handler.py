@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 from typing import Any
 
 import pytest
@@ -9,6 +10,7 @@ import pytest
 from clippy.agent.core import InterruptedExceptionError
 from clippy.agent.tool_handler import (
     ask_approval,
+    ask_approval_async,
     display_tool_request,
     handle_tool_use,
 )
@@ -486,6 +488,19 @@ def test_display_tool_request_handles_diff_variants(
     assert any("mcp__broken" in msg for msg in console.messages)
 
 
+def test_display_tool_request_shortens_inputs_with_diff(console: DummyConsole) -> None:
+    content = "x" * 1000
+
+    display_tool_request(console, "write_file", {"content": content}, diff_content="diff")
+    assert not any(content in msg for msg in console.messages)
+    assert any("(+800 chars)" in msg for msg in console.messages)
+
+    # Without a diff preview the full input is needed for approval
+    console.messages.clear()
+    display_tool_request(console, "execute_command", {"command": content})
+    assert any(content in msg for msg in console.messages)
+
+
 def test_ask_approval_responses(monkeypatch: pytest.MonkeyPatch, console: DummyConsole) -> None:
     perm_manager = PermissionManager(PermissionConfig())
 
@@ -559,6 +574,94 @@ def test_ask_approval_responses(monkeypatch: pytest.MonkeyPatch, console: DummyC
         ask_approval("write_file", {}, None, ActionType.WRITE_FILE, perm_manager, console)
 
 
+@pytest.mark.asyncio
+async def test_ask_approval_async_awaits_coroutine_callback(console: DummyConsole) -> None:
+    perm_manager = PermissionManager(PermissionConfig())
+    seen: list[str] = []
+
+    async def approve(tool_name: str, tool_input: dict[str, Any], diff: str | None) -> bool:
+        seen.append(tool_name)
+        return True
+
+    approved = await ask_approval_async(
+        "write_file", {}, None, ActionType.WRITE_FILE, perm_manager, console, approve
+    )
+
+    assert approved is True
+    assert seen == ["write_file"]
+
+
+@pytest.mark.asyncio
+async def test_ask_approval_async_awaits_wrapped_coroutine_callbacks(
+    console: DummyConsole,
+) -> None:
+    perm_manager = PermissionManager(PermissionConfig())
+
+    async def decide(
+        approved: bool, tool_name: str, tool_input: dict[str, Any], diff: str | None
+    ) -> bool:
+        return approved
+
+    class AsyncCallable:
+        async def __call__(
+            self, tool_name: str, tool_input: dict[str, Any], diff: str | None
+        ) -> bool:
+            return False
+
+    callbacks = [
+        functools.partial(decide, False),
+        lambda tool_name, tool_input, diff: decide(False, tool_name, tool_input, diff),
+        AsyncCallable(),
+    ]
+    for callback in callbacks:
+        approved = await ask_approval_async(
+            "write_file", {}, None, ActionType.WRITE_FILE, perm_manager, console, callback
+        )
+        # A returned coroutine is truthy; the denial only holds if it was awaited
+        assert approved is False
+
+    approved = await ask_approval_async(
+        "write_file",
+        {},
+        None,
+        ActionType.WRITE_FILE,
+        perm_manager,
+        console,
+        functools.partial(decide, True),
+    )
+    assert approved is True
+
+
+@pytest.mark.asyncio
+async def test_ask_approval_async_runs_prompt_in_thread(
+    monkeypatch: pytest.MonkeyPatch, console: DummyConsole
+) -> None:
+    import threading
+
+    perm_manager = PermissionManager(PermissionConfig())
+    main_thread = threading.get_ident()
+    prompt_threads: list[int] = []
+
+    def fake_input(prompt: str = "") -> str:
+        prompt_threads.append(threading.get_ident())
+        return "y"
+
+    monkeypatch.setattr("builtins.input", fake_input)
+
+    approved = await ask_approval_async(
+        "write_file", {}, None, ActionType.WRITE_FILE, perm_manager, console
+    )
+
+    assert approved is True
+    assert prompt_threads and prompt_threads[0] != main_thread
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": "n")
+    with pytest.raises(InterruptedExceptionError):
+        await ask_approval_async(
+            "write_file", {}, None, ActionType.WRITE_FILE, perm_manager, console
+        )
+
+
 def test_handle_tool_use_with_approval_callback(monkeypatch: pytest.MonkeyPatch) -> None:
     history: list[dict[str, Any]] = []
     permission_manager = PermissionManager(PermissionConfig())
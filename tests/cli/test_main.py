@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import subprocess
+import sys
 from importlib import import_module
 from types import SimpleNamespace
 from typing import Any
@@ -11,6 +13,16 @@ import pytest
 cli_main = import_module("clippy.cli.main")
 
 
+def test_import_does_not_load_mcp_sdk() -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, clippy.cli.main; print('mcp' in sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
 def test_resolve_model_none() -> None:
     assert cli_main.resolve_model(None) == (None, None, None, None)
 
@@ -238,7 +250,7 @@ def test_main_handles_mcp_manager_failure(monkeypatch: pytest.MonkeyPatch) -> No
         def start(self) -> None:
             raise RuntimeError("boom")
 
-    monkeypatch.setattr(cli_main, "Manager", FailingManager)
+    monkeypatch.setattr("clippy.mcp.manager.Manager", FailingManager)
     monkeypatch.setattr(
         cli_main,
         "ActionExecutor",
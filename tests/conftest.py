@@ -9,6 +9,15 @@ from clippy.executor import ActionExecutor
 from clippy.permissions import PermissionConfig, PermissionManager
 
 
+def stream_reply(content):
+    """Build a provider ``stream_message`` side effect that replies with ``content``."""
+
+    def stream_message(*args, **kwargs):
+        yield {"content": content, "delta": False}
+
+    return stream_message
+
+
 @pytest.fixture
 def permission_manager() -> PermissionManager:
     """Create a permission manager with default config."""
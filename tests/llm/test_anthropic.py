@@ -1,12 +1,19 @@
 """Tests for Anthropic provider."""
 
+import json
 from unittest.mock import Mock, patch
 
 import httpx
 import pytest
 
 from clippy.llm.anthropic import AnthropicProvider
-from clippy.llm.errors import APIConnectionError, APITimeoutError
+from clippy.llm.errors import (
+    APIConnectionError,
+    APITimeoutError,
+    AuthenticationError,
+    BadRequestError,
+    LLMError,
+)
 
 
 class TestAnthropicProvider:
@@ -227,6 +234,27 @@ class TestAnthropicProvider:
         assert result["usage"]["completion_tokens"] == 5
         assert result["usage"]["total_tokens"] == 15
 
+    def test_normalize_response_with_cache_usage(self):
+        """Test that prompt-cache reads and writes are counted as prompt tokens."""
+        provider = AnthropicProvider()
+
+        data = {
+            "content": [{"type": "text", "text": "Hello!"}],
+            "stop_reason": "end_turn",
+            "usage": {
+                "input_tokens": 10,
+                "cache_read_input_tokens": 900,
+                "cache_creation_input_tokens": 100,
+                "output_tokens": 5,
+            },
+        }
+
+        result = provider._normalize_response(data)
+
+        assert result["usage"]["prompt_tokens"] == 1010
+        assert result["usage"]["total_tokens"] == 1015
+        assert result["usage"]["prompt_tokens_details"] == {"cached_tokens": 900}
+
     def test_map_stop_reason(self):
         """Test mapping Anthropic stop reasons to OpenAI format."""
         provider = AnthropicProvider()
@@ -282,7 +310,13 @@ class TestAnthropicProvider:
         call_args = mock_post.call_args
         payload = call_args[1]["json"]
         assert "system" in payload
-        assert payload["system"] == "You are helpful"
+        assert payload["system"] == [
+            {
+                "type": "text",
+                "text": "You are helpful",
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
 
     @patch("clippy.llm.anthropic.post_with_retry")
     @patch("clippy.llm.anthropic.raise_for_status")
@@ -312,6 +346,73 @@ class TestAnthropicProvider:
         assert "tools" in payload
         assert "tool_calls" in result
 
+    @patch("clippy.llm.anthropic.post_with_retry")
+    @patch("clippy.llm.anthropic.raise_for_status")
+    def test_create_message_marks_cache_breakpoints(self, mock_raise_for_status, mock_post):
+        """Test that the last tool and the last message are marked as cacheable."""
+        provider = AnthropicProvider(api_key="test-key")
+
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "content": [{"type": "text", "text": "Done"}],
+            "stop_reason": "end_turn",
+        }
+        mock_post.return_value = mock_response
+
+        tools = [
+            {"type": "function", "function": {"name": "first", "description": "First"}},
+            {"type": "function", "function": {"name": "second", "description": "Second"}},
+        ]
+        user_blocks = [{"type": "text", "text": "Hello"}]
+        messages = [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello"},
+            {"role": "user", "content": user_blocks},
+        ]
+
+        provider.create_message(messages, tools=tools)
+
+        payload = mock_post.call_args[1]["json"]
+        assert "cache_control" not in payload["tools"][0]
+        assert payload["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert payload["messages"][0]["content"] == "Hi"
+        assert payload["messages"][-1]["content"] == [
+            {"type": "text", "text": "Hello", "cache_control": {"type": "ephemeral"}}
+        ]
+        # The caller's history is left untouched
+        assert user_blocks == [{"type": "text", "text": "Hello"}]
+
+    @patch("clippy.llm.anthropic.post_with_retry")
+    @patch("clippy.llm.anthropic.raise_for_status")
+    def test_create_message_reuses_converted_tools(self, mock_raise_for_status, mock_post):
+        """Test that unchanged tools are converted once and new tools are picked up."""
+        provider = AnthropicProvider(api_key="test-key")
+
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "content": [{"type": "text", "text": "Done"}],
+            "stop_reason": "end_turn",
+        }
+        mock_post.return_value = mock_response
+
+        first = {"type": "function", "function": {"name": "first", "description": "First"}}
+        second = {"type": "function", "function": {"name": "second", "description": "Second"}}
+        messages = [{"role": "user", "content": "Hi"}]
+
+        with patch.object(provider, "_convert_tools", wraps=provider._convert_tools) as convert:
+            provider.create_message(messages, tools=[first])
+            provider.create_message(messages, tools=[first])
+            assert convert.call_count == 1
+
+            provider.create_message(messages, tools=[first, second])
+            assert convert.call_count == 2
+
+        payload = mock_post.call_args[1]["json"]
+        assert [tool["name"] for tool in payload["tools"]] == ["first", "second"]
+        assert "cache_control" not in payload["tools"][0]
+        # The cache breakpoint is not written back into the reused conversion
+        assert "cache_control" not in provider._tools_cache[1][-1]
+
     @patch(
         "clippy.llm.anthropic.post_with_retry", side_effect=httpx.ConnectError("Connection failed")
     )
@@ -332,6 +433,97 @@ class TestAnthropicProvider:
         with pytest.raises(APITimeoutError):
             provider.create_message([{"role": "user", "content": "Hello"}])
 
+    @patch("clippy.llm.anthropic.stream_with_retry")
+    def test_stream_message_text_and_tool_use(self, mock_stream):
+        """Test that SSE events are yielded as deltas and reassembled at the end."""
+        provider = AnthropicProvider(api_key="test-key")
+        mock_stream.return_value = iter(
+            [
+                {"type": "message_start", "message": {"usage": {"input_tokens": 12}}},
+                {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}},
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": "Let me "},
+                },
+                {
+                    "type": "content_block_delta",
+                    "index": 0,
+                    "delta": {"type": "text_delta", "text": "check"},
+                },
+                {
+                    "type": "content_block_start",
+                    "index": 1,
+                    "content_block": {"type": "tool_use", "id": "toolu_1", "name": "read_file"},
+                },
+                {
+                    "type": "content_block_delta",
+                    "index": 1,
+                    "delta": {"type": "input_json_delta", "partial_json": '{"path": '},
+                },
+                {
+                    "type": "content_block_delta",
+                    "index": 1,
+                    "delta": {"type": "input_json_delta", "partial_json": '"a.txt"}'},
+                },
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "tool_use"},
+                    "usage": {"output_tokens": 7},
+                },
+                {"type": "message_stop"},
+            ]
+        )
+
+        chunks = list(provider.stream_message([{"role": "user", "content": "Read a.txt"}]))
+
+        assert [c["content"] for c in chunks if c.get("delta")] == ["Let me ", "check"]
+        final = chunks[-1]
+        assert final["delta"] is False
+        assert final["content"] == "Let me check"
+        assert final["finish_reason"] == "tool_calls"
+        assert final["tool_calls"][0]["id"] == "toolu_1"
+        assert json.loads(final["tool_calls"][0]["function"]["arguments"]) == {"path": "a.txt"}
+        assert final["usage"]["prompt_tokens"] == 12
+        assert final["usage"]["completion_tokens"] == 7
+        assert mock_stream.call_args[0][2]["stream"] is True
+
+    @patch("clippy.llm.anthropic.stream_with_retry")
+    def test_stream_message_error_event(self, mock_stream):
+        """Test that an error event in the stream raises an LLMError."""
+        provider = AnthropicProvider(api_key="test-key")
+        mock_stream.return_value = iter(
+            [{"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}]
+        )
+
+        with pytest.raises(LLMError, match="Overloaded"):
+            list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+
+    @patch(
+        "clippy.llm.anthropic.stream_with_retry",
+        side_effect=httpx.ConnectError("Connection failed"),
+    )
+    def test_stream_message_connect_error(self, mock_stream):
+        """Test stream_message with connection error."""
+        provider = AnthropicProvider(api_key="test-key")
+
+        with pytest.raises(APIConnectionError):
+            list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+
+    def test_stream_message_maps_http_status_errors(self):
+        """Test that HTTP errors on a stream raise the same typed errors as create_message."""
+        provider = AnthropicProvider(api_key="test-key")
+        provider._client = httpx.Client(
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    400, json={"error": {"message": "max_tokens is too large"}}
+                )
+            )
+        )
+
+        with pytest.raises(BadRequestError, match="max_tokens is too large"):
+            list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+
 
 class TestClaudeCodeOAuthProvider:
     """Test the ClaudeCodeOAuthProvider class."""
@@ -361,3 +553,63 @@ class TestClaudeCodeOAuthProvider:
         assert provider._is_auth_error(Exception("Authentication failed"))
         assert not provider._is_auth_error(Exception("Other error"))
         assert not provider._is_auth_error(Exception("Rate limit exceeded"))
+
+    def test_stream_message_reauthenticates_on_auth_error(self):
+        """Test that an auth failure on a stream retries once after re-authentication."""
+        from clippy.llm.anthropic import ClaudeCodeOAuthProvider
+
+        provider = ClaudeCodeOAuthProvider(api_key="expired")
+        retried = {"role": "assistant", "content": "Hello", "finish_reason": "stop"}
+
+        with (
+            patch(
+                "clippy.llm.anthropic.stream_with_retry",
+                side_effect=Exception("401 Unauthorized"),
+            ),
+            patch.object(
+                provider, "_handle_auth_error_and_retry", return_value=retried
+            ) as mock_retry,
+        ):
+            chunks = list(provider.stream_message([{"role": "user", "content": "Hi"}]))
+
+        mock_retry.assert_called_once()
+        assert chunks == [{**retried, "delta": False}]
+
+    def test_stream_message_does_not_reauthenticate_after_output(self):
+        """Test that a failure after chunks were yielded is raised instead of retried."""
+        from clippy.llm.anthropic import ClaudeCodeOAuthProvider
+
+        provider = ClaudeCodeOAuthProvider(api_key="token")
+
+        def stream(*args, **kwargs):
+            yield {"role": "assistant", "content": "Hel", "delta": True}
+            raise AuthenticationError("Authentication failed: token expired")
+
+        with (
+            patch.object(AnthropicProvider, "stream_message", side_effect=stream),
+            patch.object(provider, "_handle_auth_error_and_retry") as mock_retry,
+        ):
+            chunks = provider.stream_message([{"role": "user", "content": "Hi"}])
+            assert next(chunks)["content"] == "Hel"
+            with pytest.raises(AuthenticationError):
+                next(chunks)
+
+        mock_retry.assert_not_called()
+
+    def test_stream_message_ignores_token_mentions_in_other_errors(self):
+        """Test that a typed non-auth error mentioning tokens does not trigger re-auth."""
+        from clippy.llm.anthropic import ClaudeCodeOAuthProvider
+
+        provider = ClaudeCodeOAuthProvider(api_key="token")
+
+        with (
+            patch(
+                "clippy.llm.anthropic.stream_with_retry",
+                side_effect=BadRequestError("Bad request: max_tokens is too large"),
+            ),
+            patch.object(provider, "_handle_auth_error_and_retry") as mock_retry,
+            pytest.raises(BadRequestError),
+        ):
+            list(provider.stream_message([{"role": "user", "content": "Hi"}]))
+
+        mock_retry.assert_not_called()
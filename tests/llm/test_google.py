@@ -488,3 +488,24 @@ class TestGoogleProvider:
 
         assert contents == []
         assert system_instruction is None
+
+    def test_stream_message_yields_complete_response(self):
+        """Test that streaming falls back to a single final chunk."""
+        provider = GoogleProvider(api_key="test-key")
+
+        with (
+            patch("clippy.llm.google.post_with_retry") as mock_post,
+            patch("clippy.llm.google.raise_for_status"),
+        ):
+            mock_response = Mock()
+            mock_response.json.return_value = {
+                "candidates": [{"content": {"parts": [{"text": "Hi!"}]}, "finishReason": "STOP"}]
+            }
+            mock_post.return_value = mock_response
+
+            chunks = list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+
+        assert len(chunks) == 1
+        assert chunks[0]["content"] == "Hi!"
+        assert chunks[0]["finish_reason"] == "stop"
+        assert chunks[0]["delta"] is False
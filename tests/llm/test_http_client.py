@@ -5,7 +5,7 @@ from unittest.mock import Mock, patch
 import httpx
 import pytest
 
-from clippy.llm.http_client import create_client, post_with_retry
+from clippy.llm.http_client import DEFAULT_LIMITS, create_client, post_with_retry
 
 
 class TestHttpClientSimple:
@@ -22,6 +22,14 @@ class TestHttpClientSimple:
         assert client == mock_client
         mock_httpx.Client.assert_called_once()
 
+    @patch("clippy.llm.http_client.httpx.Client")
+    def test_create_client_keeps_idle_connections_between_turns(self, mock_client_cls):
+        """Test create_client keeps idle connections alive longer than httpx's default."""
+        create_client()
+
+        assert mock_client_cls.call_args[1]["limits"] is DEFAULT_LIMITS
+        assert DEFAULT_LIMITS.keepalive_expiry > httpx.Limits().keepalive_expiry
+
     def test_post_with_retry_basic_success(self):
         """Test post_with_retry succeeds on first attempt."""
         mock_client = Mock()
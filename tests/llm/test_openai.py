@@ -126,3 +126,81 @@ class TestOpenAIProviderSimple:
         result = provider._normalize_responses_response(responses_data)
         assert result["role"] == "assistant"
         assert result["content"] == "Response"
+
+    @patch("clippy.llm.openai.stream_with_retry")
+    def test_stream_message_reads_trailing_usage_chunk(self, mock_stream):
+        """Test that usage sent after the finish chunk is attached to the final chunk."""
+        provider = OpenAIProvider(api_key="test-key")
+        usage = {"prompt_tokens": 20, "completion_tokens": 2, "total_tokens": 22}
+        mock_stream.return_value = iter(
+            [
+                {"choices": [{"delta": {"content": "Hi"}, "finish_reason": None}]},
+                {"choices": [{"delta": {}, "finish_reason": "stop"}]},
+                {"choices": [], "usage": usage},
+            ]
+        )
+
+        chunks = list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+
+        assert mock_stream.call_args[0][2]["stream_options"] == {"include_usage": True}
+        assert [c["content"] for c in chunks if c.get("delta")] == ["Hi"]
+        final = chunks[-1]
+        assert final["delta"] is False
+        assert final["content"] == "Hi"
+        assert final["finish_reason"] == "stop"
+        assert final["usage"] == usage
+
+    @patch("clippy.llm.openai.stream_with_retry")
+    def test_stream_message_usage_on_finish_chunk(self, mock_stream):
+        """Test that usage reported on the finish chunk itself is kept."""
+        provider = OpenAIProvider(api_key="test-key")
+        usage = {"prompt_tokens": 20, "completion_tokens": 2, "total_tokens": 22}
+        mock_stream.return_value = iter(
+            [
+                {"choices": [{"delta": {"content": "Hi"}, "finish_reason": None}]},
+                {"choices": [{"delta": {}, "finish_reason": "stop"}], "usage": usage},
+            ]
+        )
+
+        chunks = list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+
+        assert len([c for c in chunks if not c.get("delta")]) == 1
+        assert chunks[-1]["usage"] == usage
+
+    @patch("clippy.llm.openai.stream_with_retry")
+    def test_stream_message_retries_without_stream_options_when_rejected(self, mock_stream):
+        """Test that a backend rejecting stream_options gets one retry without it."""
+        provider = OpenAIProvider(api_key="test-key", base_url="http://localhost:1234/v1")
+        request = httpx.Request("POST", "http://localhost:1234/v1/chat/completions")
+        rejection = httpx.HTTPStatusError(
+            "Bad request", request=request, response=httpx.Response(400, request=request)
+        )
+
+        def stream(client, url, payload, headers):
+            if "stream_options" in payload:
+                raise rejection
+            yield {"choices": [{"delta": {"content": "Hi"}, "finish_reason": "stop"}]}
+
+        mock_stream.side_effect = stream
+
+        chunks = list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+        assert chunks[-1]["content"] == "Hi"
+        assert mock_stream.call_count == 2
+
+        # Later streams skip the rejected field instead of failing first
+        list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+        assert mock_stream.call_count == 3
+        assert "stream_options" not in mock_stream.call_args[0][2]
+
+    @patch("clippy.llm.openai.stream_with_retry")
+    def test_stream_message_other_errors_are_not_retried(self, mock_stream):
+        """Test that errors unrelated to stream_options propagate without a retry."""
+        provider = OpenAIProvider(api_key="test-key")
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        mock_stream.side_effect = httpx.HTTPStatusError(
+            "Unauthorized", request=request, response=httpx.Response(401, request=request)
+        )
+
+        with pytest.raises(httpx.HTTPStatusError):
+            list(provider.stream_message([{"role": "user", "content": "Hello"}]))
+        assert mock_stream.call_count == 1
@@ -1,9 +1,10 @@
 """Tests for command safety agent caching functionality."""
 
 import time
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from clippy.agent.command_safety_checker import SafetyCache, SafetyDecision, create_safety_checker
+from tests.conftest import stream_reply
 
 
 class TestSafetyCache:
@@ -46,6 +47,14 @@ class TestSafetyCache:
         result = cache.get("test", "/home")
         assert result is None
 
+    def test_cache_expiration_ignores_wall_clock_changes(self):
+        """Test that a wall clock jump doesn't expire or resurrect entries."""
+        cache = SafetyCache(max_size=10, ttl=60)
+        cache.put("test", "/home", True, "Test reason")
+
+        with patch("clippy.agent.command_safety_checker.time.time", return_value=1e12):
+            assert cache.get("test", "/home") == (True, "Test reason")
+
     def test_cache_lru_eviction(self):
         """Test LRU eviction when cache is full."""
         cache = SafetyCache(max_size=2, ttl=3600)
@@ -85,6 +94,21 @@ class TestSafetyCache:
         assert cache.get("cmd2", "/dir2") is None
         assert cache.get("cmd3", "/dir3") is not None
 
+    def test_cache_put_existing_entry_updates_position(self):
+        """Test that re-caching an entry replaces it and marks it recently used."""
+        cache = SafetyCache(max_size=2, ttl=3600)
+
+        cache.put("cmd1", "/dir1", True, "Reason 1")
+        cache.put("cmd2", "/dir2", False, "Reason 2")
+        cache.put("cmd1", "/dir1", False, "Updated")
+
+        # Add cmd3 (should evict cmd2, not the refreshed cmd1)
+        cache.put("cmd3", "/dir3", True, "Reason 3")
+
+        assert cache.get("cmd1", "/dir1") == (False, "Updated")
+        assert cache.get("cmd2", "/dir2") is None
+        assert cache.get_stats()["size"] == 2
+
     def test_cache_key_generation(self):
         """Test that cache keys are generated correctly."""
         cache = SafetyCache()
@@ -106,6 +130,56 @@ class TestSafetyCache:
         key5 = cache._generate_key("  ls -la  ", "  /home/user  ")
         assert key1 == key5
 
+    def test_cache_key_collapses_blanks_but_not_newlines(self):
+        """Test that spacing variations share a key while separate commands don't."""
+        cache = SafetyCache()
+
+        cache.put("rm  -r \tbuild", "/tmp", True, "Build output")
+
+        assert cache.get("rm -r build", "/tmp") == (True, "Build output")
+        assert cache.get("rm -r\nbuild", "/tmp") is None
+
+    def test_cache_key_keeps_quoted_and_escaped_whitespace(self):
+        """Test that whitespace inside quotes, escapes or heredocs keeps commands distinct."""
+        cache = SafetyCache()
+
+        cache.put('grep "a  b"  f', "/tmp", True, "Search")
+        cache.put("echo 'x   y' >  file", "/tmp", True, "Write")
+        cache.put("touch a\\  b", "/tmp", True, "Touch")
+        cache.put("cat <<EOF > f\nx  y\nEOF", "/tmp", True, "Heredoc")
+
+        assert cache.get('grep "a  b" f', "/tmp") == (True, "Search")
+        assert cache.get('grep "a b" f', "/tmp") is None
+        assert cache.get("echo 'x   y' > file", "/tmp") == (True, "Write")
+        assert cache.get("echo 'x y' > file", "/tmp") is None
+        assert cache.get("touch a\\ b", "/tmp") is None
+        assert cache.get("cat <<EOF > f\nx y\nEOF", "/tmp") is None
+
+    def test_cache_key_normalizes_working_dir(self, tmp_path, monkeypatch):
+        """Test that equivalent spellings of a directory share one cache entry."""
+        cache = SafetyCache()
+        project = tmp_path / "project"
+        project.mkdir()
+        (tmp_path / "link").symlink_to(project)
+        monkeypatch.chdir(project)
+
+        cache.put("make deploy", str(project), True, "Project target")
+
+        assert cache.get("make deploy", f"{project}/") == (True, "Project target")
+        assert cache.get("make deploy", str(tmp_path / "link")) == (True, "Project target")
+        assert cache.get("make deploy", f"{project}/../project") == (True, "Project target")
+        assert cache.get("make deploy", ".") == (True, "Project target")
+        assert cache.get("make deploy", str(tmp_path)) is None
+
+    def test_cache_keys_do_not_collide_across_fields(self):
+        """Test that a separator inside the command can't alias another directory."""
+        cache = SafetyCache()
+
+        cache.put("echo a|b", "/tmp", True, "Pipe to b")
+
+        assert cache.get("echo a", "b|/tmp") is None
+        assert cache.get("echo a|b", "/tmp") == (True, "Pipe to b")
+
     def test_cache_stats(self):
         """Test cache statistics."""
         cache = SafetyCache(max_size=5, ttl=3600)
@@ -146,19 +220,19 @@ class TestCommandSafetyCheckerWithCache:
     def test_cache_hit(self):
         """Test that cache hits avoid LLM calls."""
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "ALLOW: Safe command"}
+        mock_provider.stream_message.side_effect = stream_reply("ALLOW: Safe command")
 
         checker = create_safety_checker(mock_provider, "test-model", cache_size=100, cache_ttl=3600)
 
         # First call should hit LLM
         result1 = checker.check_command_safety("ls -la", "/home/user")
         assert result1 == (True, "Safe command")
-        assert mock_provider.create_message.call_count == 1
+        assert mock_provider.stream_message.call_count == 1
 
         # Second call should hit cache
         result2 = checker.check_command_safety("ls -la", "/home/user")
         assert result2 == result1
-        assert mock_provider.create_message.call_count == 1  # No additional calls
+        assert mock_provider.stream_message.call_count == 1  # No additional calls
 
         # Check cache stats
         stats = checker.get_cache_stats()
@@ -169,9 +243,9 @@ class TestCommandSafetyCheckerWithCache:
     def test_cache_miss(self):
         """Test that different commands miss cache."""
         mock_provider = Mock()
-        mock_provider.create_message.side_effect = [
-            {"content": "ALLOW: Safe command"},
-            {"content": "BLOCK: Dangerous command"},
+        mock_provider.stream_message.side_effect = [
+            stream_reply("ALLOW: Safe command")(),
+            stream_reply("BLOCK: Dangerous command")(),
         ]
 
         checker = create_safety_checker(mock_provider, "test-model", cache_size=100, cache_ttl=3600)
@@ -182,7 +256,7 @@ class TestCommandSafetyCheckerWithCache:
 
         assert result1 == (True, "Safe command")
         assert result2 == (False, "Dangerous command")
-        assert mock_provider.create_message.call_count == 2
+        assert mock_provider.stream_message.call_count == 2
 
         # Check cache stats
         stats = checker.get_cache_stats()
@@ -193,7 +267,7 @@ class TestCommandSafetyCheckerWithCache:
     def test_cache_disabled(self):
         """Test safety checker with cache disabled."""
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "ALLOW: Safe command"}
+        mock_provider.stream_message.side_effect = stream_reply("ALLOW: Safe command")
 
         checker = create_safety_checker(mock_provider, "test-model", cache_size=0, cache_ttl=0)
 
@@ -204,7 +278,7 @@ class TestCommandSafetyCheckerWithCache:
         result2 = checker.check_command_safety("ls -la", "/home/user")
 
         assert result1 == result2
-        assert mock_provider.create_message.call_count == 2  # No caching
+        assert mock_provider.stream_message.call_count == 2  # No caching
 
         # Cache stats should indicate disabled
         stats = checker.get_cache_stats()
@@ -216,7 +290,7 @@ class TestCommandSafetyCheckerWithCache:
     def test_cache_not_used_for_errors(self):
         """Test that error results are not cached."""
         mock_provider = Mock()
-        mock_provider.create_message.side_effect = Exception("LLM failed")
+        mock_provider.stream_message.side_effect = Exception("LLM failed")
 
         checker = create_safety_checker(mock_provider, "test-model", cache_size=100, cache_ttl=3600)
 
@@ -228,12 +302,12 @@ class TestCommandSafetyCheckerWithCache:
         # Second call should also fail and hit LLM again
         result2 = checker.check_command_safety("test", "/dir")
         assert result2 == result1
-        assert mock_provider.create_message.call_count == 2  # Both calls hit LLM
+        assert mock_provider.stream_message.call_count == 2  # Both calls hit LLM
 
     def test_cache_clear_functionality(self):
         """Test cache clearing functionality."""
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "ALLOW: Safe command"}
+        mock_provider.stream_message.side_effect = stream_reply("ALLOW: Safe command")
 
         checker = create_safety_checker(mock_provider, "test-model", cache_size=100, cache_ttl=3600)
 
@@ -258,7 +332,7 @@ class TestCommandSafetyCheckerWithCache:
     def test_cache_performance_stats(self):
         """Test cache performance statistics accuracy."""
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "ALLOW: Safe command"}
+        mock_provider.stream_message.side_effect = stream_reply("ALLOW: Safe command")
 
         checker = create_safety_checker(mock_provider, "test-model", cache_size=100, cache_ttl=3600)
 
@@ -282,24 +356,40 @@ class TestSafetyDecision:
 
     def test_decision_creation(self):
         """Test creating SafetyDecision objects."""
-        decision = SafetyDecision(is_safe=True, reason="Safe command", timestamp=time.time())
+        decision = SafetyDecision(
+            is_safe=True, reason="Safe command", expires_at=time.monotonic() + 60
+        )
 
         assert decision.is_safe is True
         assert decision.reason == "Safe command"
-        assert isinstance(decision.timestamp, float)
+        assert isinstance(decision.expires_at, float)
+        # Slotted, so entries don't each carry an instance dict
+        assert not hasattr(decision, "__dict__")
 
     def test_decision_expiration(self):
         """Test expiration logic."""
-        now = time.time()
+        now = time.monotonic()
 
         # Not expired
-        decision1 = SafetyDecision(True, "Test", now)
-        assert not decision1.is_expired(3600)  # 1 hour TTL
+        decision1 = SafetyDecision(True, "Test", now + 3600)  # Expires in 1 hour
+        assert not decision1.is_expired()
 
         # Expired
-        decision2 = SafetyDecision(True, "Test", now - 3700)  # More than 1 hour ago
-        assert decision2.is_expired(3600)
+        decision2 = SafetyDecision(True, "Test", now - 100)  # Expired 100 seconds ago
+        assert decision2.is_expired()
+
+        # Not expired with a deadline that's very close
+        decision3 = SafetyDecision(True, "Test", now + 20)  # Expires in 20 seconds
+        assert not decision3.is_expired()
+
+    def test_cache_sets_expiry_from_ttl(self):
+        """Test that the cache stores an absolute deadline based on its TTL."""
+        cache = SafetyCache(max_size=10, ttl=30)
+
+        with patch("clippy.agent.command_safety_checker.time.monotonic", return_value=100.0):
+            cache.put("test", "/home", True, "Test reason")
+
+        assert cache._cache[("test", "/home")].expires_at == 130.0
 
-        # Not expired with very recent timestamp
-        decision3 = SafetyDecision(True, "Test", now - 10)  # 10 seconds ago
-        assert not decision3.is_expired(30)  # 30 second TTL
+        with patch("clippy.agent.command_safety_checker.time.monotonic", return_value=130.5):
+            assert cache.get("test", "/home") is None
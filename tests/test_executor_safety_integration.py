@@ -4,6 +4,8 @@ from unittest.mock import Mock, patch
 
 from clippy.executor import ActionExecutor
 from clippy.permissions import PermissionConfig, PermissionManager
+from clippy.settings import reset_settings
+from tests.conftest import stream_reply
 
 
 class TestExecutorSafetyIntegration:
@@ -27,7 +29,7 @@ class TestExecutorSafetyIntegration:
 
         permission_manager = PermissionManager(PermissionConfig())
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "BLOCK: Too dangerous"}
+        mock_provider.stream_message.side_effect = stream_reply("BLOCK: Too dangerous")
 
         executor = ActionExecutor(
             permission_manager, llm_provider=mock_provider, model="test-model"
@@ -50,7 +52,7 @@ class TestExecutorSafetyIntegration:
 
         permission_manager = PermissionManager(PermissionConfig())
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "ALLOW: Simple echo command"}
+        mock_provider.stream_message.side_effect = stream_reply("ALLOW: Simple echo command")
 
         executor = ActionExecutor(
             permission_manager, llm_provider=mock_provider, model="test-model"
@@ -72,7 +74,7 @@ class TestExecutorSafetyIntegration:
 
         permission_manager = PermissionManager(PermissionConfig())
         mock_provider = Mock()
-        mock_provider.create_message.side_effect = Exception("LLM down")
+        mock_provider.stream_message.side_effect = Exception("LLM down")
 
         executor = ActionExecutor(
             permission_manager, llm_provider=mock_provider, model="test-model"
@@ -104,7 +106,7 @@ class TestExecutorSafetyIntegration:
 
         # Now add safety checker
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "BLOCK: Dangerous"}
+        mock_provider.stream_message.side_effect = stream_reply("BLOCK: Dangerous")
         executor.set_llm_provider(mock_provider, "test-model")
 
         # Command should now be blocked
@@ -122,7 +124,7 @@ class TestExecutorSafetyIntegration:
 
         permission_manager = PermissionManager(PermissionConfig())
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {"content": "ALLOW: Safe"}
+        mock_provider.stream_message.side_effect = stream_reply("ALLOW: Safe")
 
         executor = ActionExecutor(
             permission_manager, llm_provider=mock_provider, model="test-model"
@@ -133,7 +135,7 @@ class TestExecutorSafetyIntegration:
         )
 
         # Check that the safety checker was called with the working directory
-        call_args = mock_provider.create_message.call_args[0][0]
+        call_args = mock_provider.stream_message.call_args[0][0]
         user_message = None
         for msg in call_args:
             if msg["role"] == "user":
@@ -143,3 +145,20 @@ class TestExecutorSafetyIntegration:
         assert user_message is not None
         assert "Working directory: /etc" in user_message
         assert "Command to evaluate: ls" in user_message
+
+    def test_safety_model_setting_overrides_main_model(self, monkeypatch):
+        """Test that CLIPPY_SAFETY_MODEL routes safety checks to a separate model."""
+        monkeypatch.setenv("CLIPPY_SAFETY_MODEL", "small-model")
+        reset_settings()
+        try:
+            executor = ActionExecutor(
+                PermissionManager(PermissionConfig()),
+                llm_provider=Mock(),
+                model="main-model",
+            )
+            assert executor.get_safety_checker_model() == "small-model"
+
+            executor.set_llm_provider(Mock(), "other-model")
+            assert executor.get_safety_checker_model() == "small-model"
+        finally:
+            reset_settings()
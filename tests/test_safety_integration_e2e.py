@@ -4,6 +4,7 @@ from unittest.mock import Mock, patch
 
 from clippy.executor import ActionExecutor
 from clippy.permissions import PermissionConfig, PermissionManager
+from tests.conftest import stream_reply
 
 
 class TestSafetyIntegrationE2E:
@@ -15,9 +16,9 @@ class TestSafetyIntegrationE2E:
 
         # Mock LLM provider that blocks rm -rf commands
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {
-            "content": "BLOCK: Would delete entire filesystem - extremely dangerous"
-        }
+        mock_provider.stream_message.side_effect = stream_reply(
+            "BLOCK: Would delete entire filesystem - extremely dangerous"
+        )
 
         executor = ActionExecutor(
             permission_manager, llm_provider=mock_provider, model="test-model"
@@ -40,9 +41,9 @@ class TestSafetyIntegrationE2E:
 
         # Mock LLM provider that allows ls commands
         mock_provider = Mock()
-        mock_provider.create_message.return_value = {
-            "content": "ALLOW: Simple directory listing command"
-        }
+        mock_provider.stream_message.side_effect = stream_reply(
+            "ALLOW: Simple directory listing command"
+        )
 
         with patch("clippy.executor.execute_command") as mock_execute:
             mock_execute.return_value = (
@@ -79,12 +80,14 @@ class TestSafetyIntegrationE2E:
             # Check working directory from user message
             user_msg = next(m["content"] for m in messages if m["role"] == "user")
             if "/home/user" in user_msg:
-                return {"content": "ALLOW: Safe directory"}
+                content = "ALLOW: Safe directory"
             elif "/etc" in user_msg:
-                return {"content": "BLOCK: System directory modification"}
-            return {"content": "ALLOW: Unknown context"}
+                content = "BLOCK: System directory modification"
+            else:
+                content = "ALLOW: Unknown context"
+            yield {"content": content, "delta": False}
 
-        mock_provider.create_message.side_effect = mock_response
+        mock_provider.stream_message.side_effect = mock_response
 
         with patch("clippy.executor.execute_command") as mock_execute:
             mock_execute.return_value = (True, "Success", "output")
@@ -3,6 +3,8 @@
 import os
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from clippy.utils import (
     _truncate_command_output,
     _truncate_directory_listing,
@@ -12,12 +14,21 @@ from clippy.utils import (
     _truncate_webpage_content,
     count_tokens,
     format_over_size_warning,
+    get_encoding_for_model,
     get_max_tool_result_tokens,
     smart_truncate_tool_result,
     truncate_text_to_tokens,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_encoding_cache():
+    """Keep cached encodings from leaking between tests that patch tiktoken."""
+    get_encoding_for_model.cache_clear()
+    yield
+    get_encoding_for_model.cache_clear()
+
+
 class TestCountTokens:
     """Test token counting functionality."""
 
@@ -60,6 +71,16 @@ class TestCountTokens:
         assert result == 5
         mock_get_encoding.assert_called_with("cl100k_base")
 
+    @patch("clippy.utils.tiktoken.encoding_for_model")
+    def test_count_tokens_resolves_encoding_once(self, mock_encoding_for_model):
+        """Test that the encoding is looked up once per model."""
+        mock_encoding_for_model.return_value.encode.return_value = [1, 2]
+
+        assert count_tokens("a b", "gpt-4") == 2
+        assert count_tokens("c d", "gpt-4") == 2
+
+        mock_encoding_for_model.assert_called_once_with("gpt-4")
+
     @patch("clippy.utils.tiktoken.encoding_for_model")
     def test_count_tokens_exception_handling(self, mock_encoding_for_model):
         """Test exception handling in count_tokens."""